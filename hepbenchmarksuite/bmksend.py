@@ -107,15 +107,23 @@ def main():
 
     # send
     sentcount = 0
-    for file in sendlist:
-        if args.dryrun:
-            pass
-        else:
+    if args.dryrun:
+        pass
+    elif active_config.get("activemq", False) and sendlist:
+        # All the reports are sent over a single connection to the broker,
+        # the reports that fail are logged by send_messages and not counted
+        try:
+            for file in send_queue.send_messages(sendlist, active_config["activemq"]):
+                print("Sent {}".format(file))
+                sentcount += 1
+        except Exception as err:
+            logger.error("Something went wrong attempting to report via AMQ.")
+            logger.error("Results may not have been correctly transmitted.")
+            logger.exception(err)
+    else:
+        for file in sendlist:
             try:
-                if active_config.get("activemq", False):
-                    connection = active_config["activemq"]
-                    send_queue.send_message(file, connection)
-                elif active_config.get("opensearch", False):
+                if active_config.get("opensearch", False):
                     connection = active_config["opensearch"]
                     send_opensearch.send_message(file, connection)
                 else:
@@ -10,7 +10,6 @@ import json
 import logging
 import os
 import time
-import math
 
 import importlib_resources
 
@@ -174,24 +173,12 @@ class HepBenchmarkSuite:
 
     def _save_complete_report(self):
 
-        def nan2None(obj):
-            if isinstance(obj, dict):
-                return {k:nan2None(v) for k,v in obj.items()}
-            elif isinstance(obj, list):
-                return [nan2None(v) for v in obj]
-            elif isinstance(obj, float) and math.isnan(obj):
-                return None
-            return obj
-
-        class NanConverter(json.JSONEncoder):
-            def encode(self, obj, *args, **kwargs):
-                return super().encode(nan2None(obj), *args, **kwargs)
-
         report_file_path = os.path.join(self._config['rundir'], "bmkrun_report.json")
-        with open(report_file_path, 'w', encoding='utf-8') as output_file:
-            dump = json.dumps(self._result, cls=NanConverter)
+        with open(report_file_path, 'wb') as output_file:
+            dump = utils.dump_report_json(self._result)
             _log.info("Saving final report: %s", report_file_path)
-            _log.debug("Report: %s", dump)
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug("Report: %s", dump.decode('utf-8'))
             output_file.write(dump)
 
     def _check_for_workload_errors(self):
@@ -6,7 +6,7 @@
 ###############################################################################
 """
 
-from glob import glob
+import functools
 import json
 import logging
 import os
@@ -15,12 +15,66 @@ import re
 import socket
 import sys
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import distro
 
 from hepbenchmarksuite import utils
 
 _log = logging.getLogger(__name__)
 
+# Precompiled regex used by the parsers
+_REG_MEMINFO   = re.compile(r"^(?P<Field>\w+):\s*(?P<value>\d+)", re.MULTILINE)
+_REG_DISK_FIELD = re.compile(r"^[ \t]*(?P<Field>logical name|product|size):[ \t]+(?P<value>.*)$", re.MULTILINE)
+_REG_KERNEL = re.compile(r"^(?P<version>\d+)(?:\.(?P<major>\d+))?(?:\.(?P<minor>\d+))?[^-]*"
+                         r"(?P<suffix>-(?P<abi>\d+(?:\.\d+)*(?=[.-]|$))?)?")
+_REG_DMI_RECORD = re.compile(r"\n(?=Handle 0x)")
+_REG_DMI_HANDLE = re.compile(r"Handle 0x[0-9A-Fa-f]+, DMI type (?P<type>\d+)")
+
+# Seconds after which a stuck metadata command (e.g. ipmitool on an unresponsive BMC) is killed
+CMD_TIMEOUT = 120
+
+# DMI types collected from dmidecode
+DMI_BIOS = 0
+DMI_SYSTEM = 1
+DMI_MEMORY = 17
+
+# DMI entries exposed in sysfs, readable for users on most systems
+SYSFS_DMI_PATH = "/sys/class/dmi/id/"
+SYSFS_BIOS_FIELDS = {
+    "Version"       : "bios_version",
+    "Vendor"        : "bios_vendor",
+    "Release Date"  : "bios_date",
+    "Board Version" : "board_version",
+    "Board Vendor"  : "board_vendor",
+}
+SYSFS_SYSTEM_FIELDS = {
+    "Manufacturer"  : "sys_vendor",
+    "Product Name"  : "product_name",
+    "Version"       : "product_version",
+}
+
+# Block devices exposed in sysfs, sizes are always given in 512 bytes sectors
+SYSFS_BLOCK_PATH = "/sys/block/"
+SECTOR_SIZE = 512
+SYSFS_NODE_PATH = "/sys/devices/system/node/"
+
+# CPU entries read from /proc/cpuinfo when missing in the lscpu output
+CPUINFO_FIELDS = {
+    "CPU_Model"  : "model name",
+    "CPU_Family" : "cpu family",
+    "Vendor_ID"  : "vendor_id",
+    "Stepping"   : "stepping",
+}
+
+# Placeholder values reported by dmidecode for empty memory slots
+_MEM_EMPTY_SLOT = {
+    "Size"         : "No Module Installed",
+    "Part Number"  : "NO DIMM",
+    "Manufacturer" : "NO DIMM",
+    "Type"         : "Unknown",
+}
+
 
 def not_available(x):
     """Accepts one argument, which it deletes and returns 'not_available'"""
@@ -28,6 +82,43 @@ def not_available(x):
     return "not_available"
 
 
+@functools.lru_cache(maxsize=None)
+def which(name):
+    """Memoized shutil.which, the PATH is only searched once per executable."""
+    return shutil.which(name)
+
+
+def parse_fields(text):
+    """Split a command output into a dict of `Field: Value` lines.
+
+    The first occurrence of a field wins and fields without a value are ignored.
+    """
+    fields = {}
+    for line in text.splitlines():
+        field, separator, value = line.partition(":")
+        field = field.strip()
+        value = value.strip()
+        if separator and field and value:
+            fields.setdefault(field, value)
+    return fields
+
+
+def get_cmd(name, *args):
+    """Build the argument list of a command, using the absolute path of the executable when found."""
+    return [which(name) or name, *args]
+
+
+def read_file(path):
+    """Read a procfs/sysfs file, returns 'not_available' if it cannot be read or is empty."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            content = file.read().strip()
+    except OSError:
+        _log.debug("Unable to read file: %s", path)
+        return "not_available"
+    return content if content else "not_available"
+
+
 class Extractor:
     """********************************************************
                     *** HEP-BENCHMARK-SUITE ***
@@ -44,6 +135,11 @@ class Extractor:
         self.data = {}
         self.pkg = {}
         self.extra = extra
+        self._dmidecode = None
+        self._sysfs_dmi = None
+        self._cache = {}
+        # Guards the command outputs shared by the collectors running in parallel
+        self._lock = threading.Lock()
 
         # Check if the script is run as root user; needed to extract full data.
 
@@ -69,7 +165,7 @@ class Extractor:
 
         for pkg_name in req_packages:
 
-            _sys_pkg = shutil.which(pkg_name)
+            _sys_pkg = which(pkg_name)
 
             if _sys_pkg is not None:
                 _log.debug("Package installed: %s", pkg_name)
@@ -81,10 +177,37 @@ class Extractor:
         _log.debug("Installed packages: %s", self.pkg)
 
     def exec_cmd(self, cmd_str):
-        """Execute a command string and return its output."""
-        reply, _ = utils.exec_cmd(cmd_str)
+        """Execute a command string or argument list and return its output."""
+        reply, _ = utils.exec_cmd(cmd_str, timeout=CMD_TIMEOUT)
         return reply
 
+    def get_dmidecode(self, dmi_type):
+        """Return the parsed dmidecode records of a given DMI type.
+
+        dmidecode is executed and parsed once for all the DMI types used
+        by the extractor and the records are cached for later calls.
+        """
+        with self._lock:
+            if self._dmidecode is None:
+                self._dmidecode = Extractor.get_dmi_parser(
+                    self.exec_cmd(get_cmd("dmidecode", "-t", str(DMI_BIOS), "-t", str(DMI_SYSTEM), "-t", str(DMI_MEMORY)))
+                )
+        return self._dmidecode.get(dmi_type, [])
+
+    @staticmethod
+    def get_dmi_parser(cmd_output):
+        """Parse a dmidecode output in a single walk over its records.
+
+        Returns the `Field: Value` dicts of every record, grouped by DMI type.
+        """
+        records = {}
+        for record in _REG_DMI_RECORD.split(cmd_output):
+            header = _REG_DMI_HANDLE.match(record)
+            if header:
+                records.setdefault(int(header.group("type")), []).append(parse_fields(record))
+
+        return records
+
     def collect_sw(self):
         """Collect Software specific metadata."""
         _log.info("Collecting SW information.")
@@ -92,52 +215,15 @@ class Extractor:
         sw_cmd = {}
 
         if self.extra["mode"] == "docker":
-            sw_cmd.update({"docker": "docker version --format '{{.Server.Version}}'"})
+            sw_cmd.update({"docker": get_cmd("docker", "version", "--format", "{{.Server.Version}}")})
 
         elif self.extra["mode"] == "singularity":
-            sw_cmd.update({"singularity": "singularity version"})
+            sw_cmd.update({"singularity": get_cmd("singularity", "version")})
 
 
         dist = distro.LinuxDistribution()
         dist_version_info = dist.info()
-        plat = platform.release()
-        plat = plat.split("-")
-        kernel_parts = plat[0].split(".")
-
-        # https://en.wikipedia.org/wiki/Linux_kernel_version_history
-        try:
-            kernel_version = kernel_parts[0]
-        except (ValueError, IndexError):
-            _log.debug("unable to determine kernel version: setting -1 default")
-            kernel_version = -1
-        try:
-            major = kernel_parts[1]
-        except (ValueError, IndexError):
-            _log.debug("unable to determine major kernel revision: setting -1 default")
-            major = -1
-        try:
-            minor = kernel_parts[2]
-        except (ValueError, IndexError):
-            _log.debug("unable to determine minor kernel revision: setting -1 default")
-            minor = -1
-        try:
-            abi_parts = plat[1].split(".")
-            abi = ""
-            for abi_part in abi_parts:
-                if abi_part.isnumeric():
-                    abi += abi_part + "."
-                else:
-                    break
-            abi = abi.rstrip(".")
-        except IndexError:
-            _log.debug("unable to determine ABI, setting -1 default")
-            abi=-1
-        kernel = {
-            "version": kernel_version,
-            "major": major,
-            "minor": minor,
-            "ABI": abi
-        }
+        kernel = Extractor.get_kernel_parser(platform.release())
         operating_system = {
             "id": dist_version_info['id'],
             "id_like": dist_version_info['like'],
@@ -161,6 +247,29 @@ class Extractor:
 
         return software
 
+    @staticmethod
+    def get_kernel_parser(release):
+        """
+        Kernel parser for a release string such as 5.14.0-362.8.1.el9_3.x86_64.
+        Missing parts are set to -1, the ABI is the numeric part of the release suffix.
+        """
+        # https://en.wikipedia.org/wiki/Linux_kernel_version_history
+        result = _REG_KERNEL.match(release)
+        if result is None:
+            _log.debug("unable to determine kernel version from %s: setting -1 default", release)
+            return {"version": -1, "major": -1, "minor": -1, "ABI": -1}
+
+        # The ABI stops at the first non numeric part of the suffix,
+        # a suffix without numeric parts, e.g. -generic, has an empty ABI
+        abi = result.group("abi") or ("" if result.group("suffix") else -1)
+
+        return {
+            "version": result.group("version"),
+            "major": result.group("major") or -1,
+            "minor": result.group("minor") or -1,
+            "ABI": abi,
+        }
+
     def collect_gpu(self):
         """Collect any GPU information (nvidia/ati compat.)"""
         _log.info("Collecting GPU information.")
@@ -185,9 +294,10 @@ class Extractor:
         """Collect nvidia GPU information """
         _log.debug("Executing nvidia-smi call")
         gpus = {}
-        nvidia_smi = self.exec_cmd(
-            "nvidia-smi --format=csv,noheader --query-gpu=name,memory.total,memory.used,clocks.current.graphics,clocks.current.sm,pci.bus_id,index,power.draw"
-        )
+        nvidia_smi = self.exec_cmd(get_cmd(
+            "nvidia-smi", "--format=csv,noheader",
+            "--query-gpu=name,memory.total,memory.used,clocks.current.graphics,clocks.current.sm,pci.bus_id,index,power.draw"
+        ))
         _log.debug(f"nvidia-smi call returns: {nvidia_smi}")
 
         #[BMK-1616] call can still fail
@@ -216,10 +326,10 @@ class Extractor:
         """Collect rocm-smi GPU information """
         gpus = {}
         _log.debug("Executing rocm-smi call")
-        rocm_smi = self.exec_cmd(
-            "rocm-smi --alldevices --showbus --showmemuse --showmeminfo VRAM \
-                --showproductname -P -u -c --json"
-        )
+        rocm_smi = self.exec_cmd(get_cmd(
+            "rocm-smi", "--alldevices", "--showbus", "--showmemuse", "--showmeminfo", "VRAM",
+            "--showproductname", "-P", "-u", "-c", "--json"
+        ))
         _log.debug(f"rocm_smi call returns: {rocm_smi}")
         #[BMK-1616] call can still fail
         if rocm_smi != "not_available":
@@ -256,39 +366,94 @@ class Extractor:
         _log.info("Collecting CPU information.")
 
         # Get the parsing result from lscpu
-        cpu = self.get_cpu_parser(self.exec_cmd("lscpu"))
-
-        scaling_drivers = []
-        scaling_governors = []
-        for _cpu in glob("/sys/devices/system/cpu/cpu*/cpufreq/scaling_driver"):
-            with open(_cpu, "r") as file:
-                try:
-                    _driver = file.read()
-                    scaling_drivers.append(_driver.strip())
-                # skip offline CPUs
-                except OSError:
-                    pass
-        for _cpu in glob("/sys/devices/system/cpu/cpu*/cpufreq/scaling_governor"):
-            with open(_cpu, "r") as file:
-                try:
-                    _governor = file.read()
-                    scaling_governors.append(_governor.strip())
-                # skip offline CPUs
-                except OSError:
-                    pass
+        cpu = self.get_cpu_parser(self.exec_cmd(get_cmd("lscpu")))
+
+        # Fallback to the kernel interfaces for the fields missing in the lscpu output
+        if cpu["CPU_num"] < 1:
+            cpu["CPU_num"] = os.cpu_count() or -1
+        if cpu["Online_CPUs_list"] == "not_available":
+            cpu["Online_CPUs_list"] = read_file("/sys/devices/system/cpu/online")
+        if any(cpu[key] == "not_available" for key in CPUINFO_FIELDS):
+            cpuinfo = Extractor.read_cpuinfo()
+            for key, field in CPUINFO_FIELDS.items():
+                if cpu[key] == "not_available":
+                    cpu[key] = cpuinfo.get(field, "not_available")
+
+        if cpu["NUMA_nodes"] < 1:
+            cpu.update(Extractor.get_numa_parser_sysfs())
+
+        # Single traversal of the CPU directories, the values are deduplicated on the fly
+        scaling_drivers = set()
+        scaling_governors = set()
+        try:
+            with os.scandir("/sys/devices/system/cpu") as entries:
+                for entry in entries:
+                    if not (entry.name.startswith("cpu") and entry.name[3:].isdigit()):
+                        continue
+                    for sysfs_file, values in (("scaling_driver", scaling_drivers),
+                                               ("scaling_governor", scaling_governors)):
+                        try:
+                            with open(os.path.join(entry.path, "cpufreq", sysfs_file), "r") as file:
+                                values.add(file.read().strip())
+                        # skip offline CPUs
+                        except OSError:
+                            pass
+        except OSError:
+            _log.debug("Unable to list CPUs in /sys/devices/system/cpu")
 
         # Update with additional data
         cpu.update(
             {
-                "Power_Policy": " ".join(sorted(set(scaling_governors))),
-                "Power_Driver": " ".join(sorted(set(scaling_drivers))),
-                "Microcode": self.exec_cmd("awk '/microcode/ {print $3}' /proc/cpuinfo | uniq"),
-                "SMT_Enabled": self.exec_cmd("cat /sys/devices/system/cpu/smt/active"),
+                "Power_Policy": " ".join(sorted(scaling_governors)),
+                "Power_Driver": " ".join(sorted(scaling_drivers)),
+                "Microcode": Extractor.read_microcode(),
+                "SMT_Enabled": read_file("/sys/devices/system/cpu/smt/active"),
             }
         )
 
         return cpu
 
+    @staticmethod
+    def read_cpuinfo(cpuinfo_path="/proc/cpuinfo"):
+        """Read the fields of the first processor from /proc/cpuinfo."""
+        lines = []
+        try:
+            with open(cpuinfo_path, "r", encoding="utf-8") as cpuinfo:
+                for line in cpuinfo:
+                    # processors are separated by an empty line
+                    if not line.strip():
+                        break
+                    lines.append(line)
+        except OSError:
+            _log.debug("Unable to read file: %s", cpuinfo_path)
+
+        return parse_fields("".join(lines))
+
+    @staticmethod
+    def get_microcode_parser(cpuinfo_lines):
+        """Microcode parser for /proc/cpuinfo lines, consecutive duplicates are collapsed."""
+        microcodes = []
+        for line in cpuinfo_lines:
+            if line.startswith("microcode"):
+                value = line.partition(":")[2].strip()
+                if value and (not microcodes or microcodes[-1] != value):
+                    microcodes.append(value)
+
+        return "\n".join(microcodes) if microcodes else "not_available"
+
+    @staticmethod
+    def read_microcode(cpuinfo_path="/proc/cpuinfo"):
+        """
+        Read the microcode versions from /proc/cpuinfo.
+        The file is streamed line by line, procfs files cannot be mmap'ed.
+        """
+        try:
+            with open(cpuinfo_path, "r", encoding="utf-8") as cpuinfo:
+                return Extractor.get_microcode_parser(cpuinfo)
+        except OSError:
+            _log.debug("Unable to read file: %s", cpuinfo_path)
+            return "not_available"
+
     def get_cpu_parser(self, cmd_output):
         """Collect all CPU data from lscpu."""
         parse_lscpu = self.get_parser(cmd_output, "lscpu")
@@ -313,11 +478,11 @@ class Extractor:
             "Architecture"      : conv("Architecture"),
             "CPU_Model"         : conv("Model name"),
             "CPU_Family"        : conv("CPU family"),
-            "CPU_num"           : conv(r"CPU\(s\)", int),
-            "Online_CPUs_list"  : conv(r"On-line CPU\(s\) list"),
-            "Threads_per_core"  : conv(r"Thread\(s\) per core", int),
-            "Cores_per_socket"  : conv(r"Core\(s\) per socket", int),
-            "Sockets"           : conv(r"Socket\(s\)", int),
+            "CPU_num"           : conv("CPU(s)", int),
+            "Online_CPUs_list"  : conv("On-line CPU(s) list"),
+            "Threads_per_core"  : conv("Thread(s) per core", int),
+            "Cores_per_socket"  : conv("Core(s) per socket", int),
+            "Sockets"           : conv("Socket(s)", int),
             "Vendor_ID"         : conv("Vendor ID"),
             "Stepping"          : conv("Stepping"),
             "CPU_MHz"           : conv("CPU MHz", float),
@@ -326,7 +491,7 @@ class Extractor:
             "BogoMIPS"          : conv("BogoMIPS", float),
             "L2_cache"          : conv("L2 cache"),
             "L3_cache"          : conv("L3 cache"),
-            "NUMA_nodes"        : conv(r"NUMA node\(s\)", int),
+            "NUMA_nodes"        : conv("NUMA node(s)", int),
         }
 
         # ARM-specific logic
@@ -337,30 +502,36 @@ class Extractor:
                 cpu["CPU_Model"] = cpu["CPU_Model"] + " - " + conv("BIOS Model name")
 
         # Populate NUMA nodes
-        try:
-            for i in range(0, int(cpu["NUMA_nodes"])):
-                cpu[f"NUMA_node{i}_CPUs"] = parse_lscpu(rf"NUMA node{i} CPU\(s\)")
-        except ValueError:
-            _log.warning("Failed to parse or NUMA nodes not existent.")
+        for i in range(cpu["NUMA_nodes"]):
+            cpu[f"NUMA_node{i}_CPUs"] = parse_lscpu(f"NUMA node{i} CPU(s)")
 
         return cpu
 
+    @staticmethod
+    def get_numa_parser_sysfs(sysfs_node_path=SYSFS_NODE_PATH):
+        """NUMA topology parser reading the CPU list of each node from sysfs."""
+        try:
+            with os.scandir(sysfs_node_path) as entries:
+                nodes = sorted(int(entry.name[4:]) for entry in entries
+                               if entry.name.startswith("node") and entry.name[4:].isdigit())
+        except OSError:
+            _log.debug("Unable to list NUMA nodes in %s", sysfs_node_path)
+            return {}
+
+        if not nodes:
+            return {}
+
+        numa = {"NUMA_nodes": len(nodes)}
+        for node in nodes:
+            numa[f"NUMA_node{node}_CPUs"] = read_file(os.path.join(sysfs_node_path, f"node{node}", "cpulist"))
+
+        return numa
+
     def collect_bios(self):
         """Collect all relevant BIOS information."""
         _log.info("Collecting BIOS information.")
 
-        # Add several BIOS parsers if available
-        bios_parsers = [Extractor.parse_bios_sysfs]
-        if self.pkg["dmidecode"] and self._permission:
-            bios_parsers.append(self.get_parser(self.exec_cmd("dmidecode -t bios"), "bios"))
-
-        # Try all available BIOS parsers
-        def parse_bios(entry: str):
-            for parser in bios_parsers:
-                result = parser(entry)
-                if result != "not_available":
-                    return result
-            return result
+        parse_bios = self.get_dmi_field_parser(DMI_BIOS, SYSFS_BIOS_FIELDS, "bios")
 
         bios = {
             "Vendor": parse_bios("Vendor"),
@@ -370,52 +541,84 @@ class Extractor:
 
         return bios
 
-    def parse_bios_sysfs(sysfs_entry):
-        """
-        Read from syfs - BIOS Board entries readable for users on most systems
+    def get_sysfs_dmi(self):
+        """Read all the DMI entries from sysfs at once, the result is cached."""
+        with self._lock:
+            if self._sysfs_dmi is None:
+                sysfs_dmi = {}
+                try:
+                    with os.scandir(SYSFS_DMI_PATH) as entries:
+                        for entry in entries:
+                            if entry.is_file():
+                                value = read_file(entry.path)
+                                # Some entries are only readable by root
+                                if value != "not_available":
+                                    sysfs_dmi[entry.name] = value
+                except OSError:
+                    _log.debug("Unable to read DMI entries from %s", SYSFS_DMI_PATH)
+                self._sysfs_dmi = sysfs_dmi
+
+        return self._sysfs_dmi
+
+    def get_dmi_field_parser(self, dmi_type, sysfs_fields, reg):
+        """DMI parser reading from sysfs first.
+
+        dmidecode is only used, if available, for fields missing in sysfs.
         """
+        sysfs_dmi = self.get_sysfs_dmi()
+        dmi_fields = []
 
-        sysfs_base_path = "/sys/class/dmi/id/"
-        sysfs_dict = {
-            "Version"       : "bios_version",
-            "Vendor"        : "bios_vendor",
-            "Release Date"  : "bios_date",
-            "Board Version" : "board_version",
-            "Board Vendor"  : "board_vendor",
-        }
+        def parser(field):
+            """Parser function."""
+            if field in sysfs_fields and sysfs_fields[field] in sysfs_dmi:
+                return sysfs_dmi[sysfs_fields[field]]
 
-        try:
-            file = os.path.join(sysfs_base_path, sysfs_dict[sysfs_entry])
-            with open(file, "r", encoding="utf-8") as f:
-                return f.read().strip()
-        except OSError:
-            return "not_available"
+            if not (self.pkg["dmidecode"] and self._permission):
+                return "not_available"
+
+            if not dmi_fields:
+                fields = {}
+                for record in self.get_dmidecode(dmi_type):
+                    for key, value in record.items():
+                        fields.setdefault(key, value)
+                dmi_fields.append(fields)
 
-    def check_if_virtual(self, cmd="awk '/hypervisor/' /proc/cpuinfo"):
+            value = dmi_fields[0].get(field, "not_available")
+            _log.debug("Parsing = %s | Field = %s | Value = %s", reg, field, value)
+            return value
+
+        return parser
+
+    def check_if_virtual(self, cpuinfo_path="/proc/cpuinfo"):
         """
-        Checks if the system is virtualized by executing a command.
+        Checks if the system is virtualized from the CPU flags.
 
         Args:
-            cmd (str): The command to check virtualization. Default is 'awk '/hypervisor/' /proc/cpuinfo'.
+            cpuinfo_path (str): The cpuinfo file to read. Default is '/proc/cpuinfo'.
 
         Returns:
-            bool: True if the system is virtualized, False otherwise.
+            bool: True if the hypervisor flag is set, False otherwise.
         """
-        is_virtual = self.exec_cmd(cmd) != "not_available"
-        return is_virtual
+        try:
+            with open(cpuinfo_path, "r", encoding="utf-8") as cpuinfo:
+                for line in cpuinfo:
+                    field, separator, value = line.partition(":")
+                    # all the CPUs share the hypervisor flag, the first one is enough
+                    if separator and field.strip() == "flags":
+                        return "hypervisor" in value.split()
+        except OSError:
+            _log.debug("Unable to read file: %s", cpuinfo_path)
+
+        return False
 
     def collect_system(self):
         """Collect relevant BIOS information."""
         _log.info("Collecting system information.")
 
-        # get common parser
-        if self.pkg["dmidecode"] and self._permission:
-            parse_system = self.get_parser(self.exec_cmd("dmidecode -t system"), "system")
-        else:
-            parse_system = not_available
+        parse_system = self.get_dmi_field_parser(DMI_SYSTEM, SYSFS_SYSTEM_FIELDS, "system")
 
         try:
-            parse_bmc_fru = self.get_parser(self.exec_cmd("ipmitool fru"), "BMC")
+            parse_bmc_fru = self.get_parser(self.exec_cmd(get_cmd("ipmitool", "fru")), "BMC")
         except:
             parse_bmc_fru = lambda x: "not_available"
 
@@ -437,63 +640,53 @@ class Extractor:
         _log.info("Collecting system memory.")
 
         if self.pkg["dmidecode"] and self._permission:
-            # Execute command and get output to parse
-            cmd_output = self.exec_cmd("dmidecode -t 17")
-
-            # Get memory parser for memory listing
-            mem = Extractor.get_mem_parser(cmd_output)
+            # Get memory listing from the dmidecode memory records
+            mem = Extractor.get_dimm_parser(self.get_dmidecode(DMI_MEMORY))
 
         else:
             mem = {}
 
-        memt = self.exec_cmd("free | awk 'NR==2{print $2}'")
-        mema = self.exec_cmd("free | awk 'NR==2{print $7}'")
-        mems = self.exec_cmd("free | awk 'NR==3{print $2}'")
-        try:
-            memt = int(memt)
-        except (TypeError, ValueError):
-            _log.debug("Total memory not available, collected output: %s", memt)
-            memt = "not_available"
-        try:
-            mema = int(mema)
-        except (TypeError, ValueError):
-            _log.debug("Active memory not available, collected output: %s", mema)
-            mema = "not_available"
-        try:
-            mems = int(mems)
-        except (TypeError, ValueError):
-            _log.debug("Swap memory not available, collected output: %s", mems)
-            mems = "not_available"
-        mem.update(
-            {
-                "Mem_Total"     : memt,
-                "Mem_Available" : mema,
-                "Mem_Swap"      : mems,
-            }
-        )
+        mem.update(Extractor.get_meminfo_parser(read_file("/proc/meminfo")))
+
+        return mem
+
+    @staticmethod
+    def get_meminfo_parser(meminfo):
+        """Memory parser for /proc/meminfo, values are reported in KiB as done by `free`."""
+        fields = {
+            "MemTotal"     : "Mem_Total",
+            "MemAvailable" : "Mem_Available",
+            "SwapTotal"    : "Mem_Swap",
+        }
+        mem = dict.fromkeys(fields.values(), "not_available")
+
+        for entry in _REG_MEMINFO.finditer(meminfo):
+            if entry.group("Field") in fields:
+                mem[fields[entry.group("Field")]] = int(entry.group("value"))
+
+        for key, value in mem.items():
+            if value == "not_available":
+                _log.debug("%s not available in /proc/meminfo", key)
 
         return mem
 
     @staticmethod
     def get_mem_parser(cmd_output):
-        """Memory parser for dmidecode."""
-        # Regex for matches
-        reg_size = re.compile(r"\n\s*(?P<Field>Size:\s*\s)(?P<value>(?!No Module Installed).*\S)")
-        reg_part = re.compile(r"\n\s*(?P<Field>Part Number:\s*\s)(?P<value>(?!NO DIMM).*\S)")
-        reg_man  = re.compile(r"\n\s*(?P<Field>Manufacturer:\s*\s)(?P<value>(?!NO DIMM).*\S)")
-        reg_type = re.compile(r"\n\s*(?P<Field>Type:\s*\s)(?P<value>(?!Unknown).*\S)")
-
-        # Return iterators containing matches
-        result_size = [entry.group("value") for entry in re.finditer(reg_size, cmd_output)]
-        result_part = [entry.group("value") for entry in re.finditer(reg_part, cmd_output)]
-        result_man  = [entry.group("value") for entry in re.finditer(reg_man, cmd_output)]
-        result_type = [entry.group("value") for entry in re.finditer(reg_type, cmd_output)]
+        """Memory parser for dmidecode, each memory device record is parsed on its own."""
+        return Extractor.get_dimm_parser(Extractor.get_dmi_parser(cmd_output).get(DMI_MEMORY, []))
 
+    @staticmethod
+    def get_dimm_parser(records):
+        """Memory parser for the parsed dmidecode memory device records."""
         count = 1
         mem = {}
-        # Loop through all iterators at the same time
-        for size, part, manuf, typ in zip(result_size, result_part, result_man, result_type):
-            mem["dimm" + str(count)] = f"{size} {typ} | {manuf} | {part}"
+        for fields in records:
+            # Skip incomplete records, and empty slots reporting a placeholder in any field
+            if not all(key in fields for key in _MEM_EMPTY_SLOT) \
+                    or any(fields[key].startswith(value) for key, value in _MEM_EMPTY_SLOT.items()):
+                continue
+
+            mem["dimm" + str(count)] = f"{fields['Size']} {fields['Type']} | {fields['Manufacturer']} | {fields['Part Number']}"
             count += 1
 
         return mem
@@ -504,20 +697,13 @@ class Extractor:
 
         if self.pkg["lshw"] and self._permission:
             # Execute command and get output to parse
-            cmd_output = self.exec_cmd("lshw -c disk")
+            cmd_output = self.exec_cmd(get_cmd("lshw", "-c", "disk"))
 
             # Get storage parser
             storage = Extractor.get_storage_parser(cmd_output)
 
         else:
-            storage = {}
-            # Execute command and get output to parse
-            cmd_output = self.exec_cmd(
-                "lsblk -d -n -o NAME --exclude 7 |"
-                " xargs -I {} parted /dev/{} print unit s"
-            )
-            # Get storage parser
-            storage = Extractor.get_storage_parser_lsblk(cmd_output)
+            storage = Extractor.get_storage_parser_sysfs()
 
         return storage
 
@@ -526,23 +712,18 @@ class Extractor:
         """Storage parser for lshw -c disk."""
         disks = cmd_output.split("*-")[1:]
 
-        # Regex for matches
-        reg_logic   = re.compile(r"\n\s*(?P<Field>logical name:\s*\s)(?P<value>.*)")
-        reg_product = re.compile(r"\n\s*(?P<Field>product:\s*\s)(?P<value>.*)")
-        reg_size    = re.compile(r"\n\s*(?P<Field>size:\s*\s)(?P<value>.*)")
-
         count = 1
         storage = {}
         for disk in disks:
-            # return matches
-            result_product = re.search(reg_product, disk)
-            result_size = re.search(reg_size, disk)
-            result_logic = re.search(reg_logic, disk)
+            # single scan of the disk block, the first occurrence of a field wins
+            fields = {}
+            for entry in _REG_DISK_FIELD.finditer(disk):
+                fields.setdefault(entry.group("Field"), entry.group("value"))
 
             # replace empty values to avoid zipping error
-            product = result_product.group("value") if result_product else "n/a"
-            size = result_size.group("value") if result_size else "n/a"
-            logic = result_logic.group("value") if result_logic else "n/a"
+            logic = fields.get("logical name", "n/a")
+            product = fields.get("product", "n/a")
+            size = fields.get("size", "n/a")
 
             storage["disk" + str(count)] = f"{logic} | {product} | {size}"
             count += 1
@@ -550,88 +731,133 @@ class Extractor:
         return storage
 
     @staticmethod
-    def get_storage_parser_lsblk(cmd_output):
+    def get_storage_parser_sysfs(sysfs_block_path=SYSFS_BLOCK_PATH):
         """
-        Storage parser using the command:
-        lsblk -d -n -o NAME --exclude 7 | args -I {} parted /dev/{} print unit s
+        Storage parser reading the disks from sysfs.
+        Virtual block devices (loop, ram, device-mapper...) have no backing device and are skipped.
         """
-
-        # Regex for matches
-        reg_logic   = re.compile(r"(?P<Field>Disk /dev)(?P<value>.*)")
-        reg_product = re.compile(r"(?P<Field>Model:\s*\s)(?P<value>.*)")
-
-        # Get iterators containing matches
-        result_logic   = re.finditer(reg_logic, cmd_output)
-        result_product = re.finditer(reg_product, cmd_output)
+        try:
+            disks = sorted(
+                entry.name for entry in os.scandir(sysfs_block_path)
+                if os.path.exists(os.path.join(entry.path, "device"))
+            )
+        except OSError:
+            _log.debug("Unable to list block devices in %s", sysfs_block_path)
+            return {}
 
         storage = {}
         count = 1
-        for log, prod in zip(result_logic, result_product):
-            log_value = log.group("value")
-            logic, size = log_value.split(": ")
-            storage["disk" + str(count)] = (f"/dev{logic} | {prod.group('value')} | {size}")
+        for disk in disks:
+            disk_path = os.path.join(sysfs_block_path, disk)
+
+            vendor = read_file(os.path.join(disk_path, "device", "vendor"))
+            model = read_file(os.path.join(disk_path, "device", "model"))
+            product = " ".join(value for value in (vendor, model) if value != "not_available")
+
+            try:
+                size = Extractor.format_disk_size(int(read_file(os.path.join(disk_path, "size"))) * SECTOR_SIZE)
+            except ValueError:
+                size = "n/a"
+
+            storage["disk" + str(count)] = f"/dev/{disk} | {product or 'n/a'} | {size}"
             count += 1
 
         return storage
 
-    def get_parser(self, cmd_output, reg="common"):
-        """Common regex parser."""
+    @staticmethod
+    def format_disk_size(size_bytes):
+        """Format a size in bytes with the compact SI units used by parted, e.g. 120GB."""
+        units = ("B", "kB", "MB", "GB", "TB")
 
-        def parser(pattern):
-            """Parser function."""
-            # Different regex for parsing different outputs
-            if reg == "BMC":
-                exp = rf"(?P<Field>{pattern}\s*:\s)(?P<Value>.*)"
-            else:
-                exp = rf"(?P<Field>{pattern}:\s*\s)(?P<Value>.*)"
+        # Use the largest unit which leaves at least 10 units
+        exponent = 0
+        while exponent < len(units) - 1 and size_bytes >= 10 * 1000 ** (exponent + 1):
+            exponent += 1
 
-            # Search pattern in output
-            result = re.search(exp, cmd_output)
-            try:
-                _log.debug("Parsing = %s | Field = %s | Value = %s",
-                           reg, pattern, result.group("Value")
-                )
-                return result.group("Value")
+        size = size_bytes / 1000 ** exponent
+        precision = 2 if size < 10 else 1 if size < 100 else 0
+        return f"{size:.{precision}f}{units[exponent]}"
 
-            except AttributeError:
-                _log.debug("Parsing = %s | Field = %s | Value = %s", reg, pattern, "None")
-                return "not_available"
+    def get_parser(self, cmd_output, reg="common"):
+        """Common parser.
+
+        The output is split once into a dict of `Field: Value` lines, so each
+        lookup is a dict access instead of a regex scan of the full output.
+        The first occurrence of a field wins and fields without a value are ignored.
+        """
+        fields = parse_fields(cmd_output)
+
+        def parser(field):
+            """Parser function."""
+            value = fields.get(field, "not_available")
+            _log.debug("Parsing = %s | Field = %s | Value = %s", reg, field, value)
+            return value
 
         return parser
 
-    def collect(self):
-        """Collect all metadata."""
+    def collect(self, refresh=False):
+        """Collect all metadata.
+
+        Static sections are cached between calls, use `refresh` to collect them again.
+        """
         _log.info("Collecting the full metadata information.")
 
+        if refresh:
+            self.clear_cache()
+
         self.data["Hostname"] = socket.getfqdn()
-        self._save("SW", self.collect_sw())
+        self._save("SW", self._cached("SW", self.collect_sw))
         self._save("HW", self.collect_hw())
 
     def collect_hw(self):
-        """Collect Hardware specific metadata."""
+        """Collect Hardware specific metadata.
+
+        BIOS, system and storage information do not change while running
+        and are only collected once, the other sections are always collected.
+        The sections are independent and mostly wait for external commands,
+        so they are collected in parallel threads.
+        """
         _log.info("Collecting HW information.")
 
-        hardware = {
-            "CPU": self.collect_cpu(),
-            "GPU": self.collect_gpu(),
-            "BIOS": self.collect_bios(),
-            "SYSTEM": self.collect_system(),
-            "MEMORY": self.collect_memory(),
-            "STORAGE": self.collect_storage(),
+        collectors = {
+            "CPU": self.collect_cpu,
+            "GPU": self.collect_gpu,
+            "BIOS": functools.partial(self._cached, "BIOS", self.collect_bios),
+            "SYSTEM": functools.partial(self._cached, "SYSTEM", self.collect_system),
+            "MEMORY": self.collect_memory,
+            "STORAGE": functools.partial(self._cached, "STORAGE", self.collect_storage),
         }
+
+        with ThreadPoolExecutor(max_workers=len(collectors)) as executor:
+            futures = {section: executor.submit(collector) for section, collector in collectors.items()}
+
+        hardware = {section: future.result() for section, future in futures.items()}
         return hardware
 
+    def clear_cache(self):
+        """Drop all cached sections and command outputs."""
+        self._cache.clear()
+        self._dmidecode = None
+        self._sysfs_dmi = None
+
+    def _cached(self, section, collector):
+        """Return the cached result of a section, collecting it on the first call."""
+        if section not in self._cache:
+            self._cache[section] = collector()
+        return self._cache[section]
+
     def dump(self, stdout=False, outfile=False):
         """Dump data to stdout and json file."""
-        meta_data = json.dumps(self.data, indent=4)
+        # Serialize once for both outputs
+        meta_data = utils.dump_json(self.data)
 
         if stdout:
-            print(meta_data)
+            print(meta_data.decode("utf-8"))
 
         # Dump json data to file
         if outfile is not False:
-            with open(outfile, "w", encoding="utf-8") as json_file:
-                json.dump(self.data, json_file, indent=4, sort_keys=True)
+            with open(outfile, "wb") as json_file:
+                json_file.write(meta_data)
 
     def export(self):
         """Export collected data as a dict."""
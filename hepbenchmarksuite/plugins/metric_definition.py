@@ -1,10 +1,8 @@
-import operator
 import re
 import math
 import statistics
 import numpy as np
-from functools import reduce
-from typing import Dict, Callable, List
+from typing import Dict
 
 from hepbenchmarksuite.exceptions import PluginBuilderException
 
@@ -24,10 +22,13 @@ class MetricDefinition:
         self.interval_mins: float = self._round_interval(params['interval_mins'])
         self.command: str = params['command'].strip()
         self.regex: str = params['regex']
+        self._pattern = self._compile_regex(self.regex)
         self.unit: str = params['unit']
         self.aggregation: str = params.get('aggregation', 'default').strip()
         self.statistics: str = params.get('statistics', 'default').strip()
         self.agg_func = self._parse_aggregation(self.aggregation) 
+        # All aggregations but count and standard deviation return a single sample as is
+        self._single_value_passthrough = self.agg_func not in (len, self.safe_standard_deviation)
 
     def _check_params(self, params: Dict):
         """
@@ -44,76 +45,80 @@ class MetricDefinition:
                                          f'Required: {required_params}, optional: {optional_params},'
                                          f' given: {given_params}')
 
+    def _compile_regex(self, regex: str):
+        """
+        Compiles the metric regex once, so that it is not recompiled for every sample.
+        """
+        try:
+            return re.compile(regex)
+        except re.error as e:
+            raise PluginBuilderException(f'Invalid regex for metric {self.name}: {e}') from e
+
     def _round_interval(self, interval_mins: float):
         """
         The collection of metrics should be spaced with certain granularity.
         The interval of 18s and 20s should be the same granularity of 20s.
         """
         assert interval_mins > 0
-        interval_secs = interval_mins * 60
-        interval_rounded_secs = round(
-            interval_secs / self.interval_granularity_secs) * self.interval_granularity_secs
-        # The interval cannot be zero
-        if interval_rounded_secs == 0:
-            interval_rounded_secs = self.interval_granularity_secs
-        interval_rounded_mins = interval_rounded_secs / 60
-        return interval_rounded_mins
+        granularity = self.interval_granularity_secs
+        # The interval cannot be zero, it is at least the granularity
+        return max(granularity, round(interval_mins * 60 / granularity) * granularity) / 60
     
     @staticmethod
-    def safe_average(values: List[float]) -> float:
-        if not values:
+    def safe_average(values: np.ndarray) -> float:
+        if len(values) == 0:
             return math.nan
-        return statistics.mean(values)
+        return float(np.mean(values))
 
     @staticmethod
-    def safe_min(values: List[float]) -> float:
-        if not values:
+    def safe_min(values: np.ndarray) -> float:
+        if len(values) == 0:
             return math.nan
-        return min(values)
+        return float(np.min(values))
 
     @staticmethod
-    def safe_max(values: List[float]) -> float:
-        if not values:
+    def safe_max(values: np.ndarray) -> float:
+        if len(values) == 0:
             return math.nan
-        return max(values)
+        return float(np.max(values))
 
     @staticmethod
-    def safe_median(values: List[float]) -> float:
-        if not values:
+    def safe_median(values: np.ndarray) -> float:
+        if len(values) == 0:
             return math.nan
-        return statistics.median(values)
+        return float(np.median(values))
 
     @staticmethod
-    def safe_mode(values: List[float]) -> float:
-        if not values:
+    def safe_mode(values: np.ndarray) -> float:
+        if len(values) == 0:
             return math.nan
         try:
-            return statistics.mode(values)
+            return float(statistics.mode(values))
         except statistics.StatisticsError:
             return math.nan
 
     @staticmethod
-    def safe_standard_deviation(values: List[float]) -> float:
+    def safe_standard_deviation(values: np.ndarray) -> float:
         # stdev requires at least two data points
         if len(values) < 2:
             return math.nan
-        return statistics.stdev(values)
+        return float(np.std(values, ddof=1))
 
     @staticmethod
-    def safe_sum(values: List[float]) -> float:
-        if not values:
+    def safe_sum(values: np.ndarray) -> float:
+        if len(values) == 0:
             return math.nan
-        return sum(values)
+        return float(np.sum(values))
 
     @staticmethod
-    def safe_product(values: List[float]) -> float:
-        if not values:
+    def safe_product(values: np.ndarray) -> float:
+        if len(values) == 0:
             return math.nan
-        return reduce(operator.mul, values, 1)
+        return float(np.prod(values))
 
     def _parse_aggregation(self, aggregation_function_name: str) -> callable:
         """
-        Return a callable function that aggregates a list of floats based on the specified function name.
+        Return a callable function that aggregates an array of floats based on the specified function name.
         """
         aggregation_functions = {
             'sum': self.safe_sum,
@@ -146,8 +151,8 @@ class MetricDefinition:
                 raise ValueError("Quantile value must be between 0 and 100.")
 
             # Return a lambda that safely computes the quantile
-            def safe_quantile(values: List[float]) -> float:
-                if not values:
+            def safe_quantile(values: np.ndarray) -> float:
+                if len(values) == 0:
                     return math.nan
                 return float(np.quantile(values, q_value))
             return safe_quantile
@@ -161,15 +166,12 @@ class MetricDefinition:
         If more values are extracted, they are aggregated
         into a single value using the defined aggregation function.
         """
-        compiled_pattern = re.compile(self.regex)
-
-        matches = []
-        for match in compiled_pattern.finditer(command_output):
-            value = match['value']
-            matches.append(float(value))
-        result = [agg(matches) for agg in self.agg_func] if isinstance(self.agg_func, list) else self.agg_func(matches)
-        
-        return result
+        # All the captured values are converted at once into a float array
+        matches = np.fromiter((match['value'] for match in self._pattern.finditer(command_output)),
+                              dtype=np.float64)
+        if len(matches) == 1 and self._single_value_passthrough:
+            return float(matches[0])
+        return self.agg_func(matches)
 
     def serialize_to_dict(self) -> Dict:
         """
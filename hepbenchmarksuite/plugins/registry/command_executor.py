@@ -1,6 +1,7 @@
 import logging
 import math
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
 from math import inf
 from multiprocessing import Event
 from typing import Dict, List, Tuple
@@ -56,13 +57,25 @@ class CommandExecutor(StatefulPlugin):
         self.metrics: Dict[str, MetricDefinition] = {}
         self.timeseries: Dict[str, Timeseries] = {}
         self.command_results = {}
+        # Metrics grouped by their interval in seconds, the groups are scheduled together
+        self.interval_groups: Dict[float, List[MetricDefinition]] = {}
+        # Threads executing the commands in parallel, created on first use and shut down in on_end
+        self._pool = None
         self._initialize(metrics)
 
+    def __getstate__(self):
+        # The thread pool cannot be pickled, a new one is created on first use
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        return state
+
     def _initialize(self, metrics: Dict[str, Dict]) -> None:
         for metric_name, metric_options in metrics.items():
             self.metrics[metric_name] = MetricDefinition(metric_name, metric_options,
                                                          self.interval_granularity_secs)
             self.timeseries[metric_name] = Timeseries(metric_name, self.metrics[metric_name].statistics)
+            interval = self.metrics[metric_name].get_interval_in_secs()
+            self.interval_groups.setdefault(interval, []).append(self.metrics[metric_name])
 
     def _determine_unique_commands(self, metrics: List[MetricDefinition]):
         """
@@ -80,11 +93,11 @@ class CommandExecutor(StatefulPlugin):
             timeseries.clear()
 
     def run(self, stop_event: Event):
-        start_time = datetime.now()
+        start_time = time.monotonic()
 
         # Run immediately after start up
         self.execute(list(self.metrics.values()))
-        time_now = datetime.now()
+        time_now = time.monotonic()
         time_until_next_execution, next_metrics_to_collect = self._determine_time_until_next_execution(start_time,
                                                                                                        time_now)
         # The stop_event will time out each period unless
@@ -93,40 +106,40 @@ class CommandExecutor(StatefulPlugin):
         # method ends immediately.
         while not stop_event.wait(timeout=time_until_next_execution):
             self.execute(next_metrics_to_collect)
-            time_now = datetime.now()
+            time_now = time.monotonic()
             time_until_next_execution, next_metrics_to_collect = self._determine_time_until_next_execution(start_time,
                                                                                                            time_now)
 
     def _determine_time_until_next_execution(
-            self, start_time: datetime, time_now: datetime) -> Tuple[float, List[MetricDefinition]]:
+            self, start_time: float, time_now: float) -> Tuple[float, List[MetricDefinition]]:
         """
         Determines which interval is to be run next. It is possible that multiple
         groups should be executed. E.g., intervals of 1 and 5 minutes will be
         executed together every five minutes.
 
         Args:
-            start_time: The time of when the execution started.
+            start_time: The monotonic time in seconds of when the execution started.
+            time_now: The current monotonic time in seconds.
 
         Returns:
             Tuple of time until next execution and the groups (intervals) which should be run next round.
         """
-        groups_to_run = set()
+        groups_to_run = []
         shortest_time = inf
+        time_elapsed = time_now - start_time
 
-        for metric in self.metrics.values():
-            interval = metric.get_interval_in_secs()
-            time_elapsed_this_round = (time_now - start_time).total_seconds() % interval
+        for interval, group in self.interval_groups.items():
+            time_elapsed_this_round = time_elapsed % interval
             time_until_next_execution = interval - time_elapsed_this_round
 
             if math.isclose(time_until_next_execution, shortest_time):
-                groups_to_run.add(metric)
+                groups_to_run.extend(group)
             # Shorter time, will be executed sooner.
-            if time_until_next_execution < shortest_time:
+            elif time_until_next_execution < shortest_time:
                 shortest_time = time_until_next_execution
-                groups_to_run.clear()
-                groups_to_run.add(metric)
+                groups_to_run = list(group)
 
-        return shortest_time, list(groups_to_run)
+        return shortest_time, groups_to_run
 
     def execute(self, metrics_to_collect: List[MetricDefinition]) -> None:
         _log.debug('Executing plugin "%s"', CommandExecutor.__name__)
@@ -136,15 +149,31 @@ class CommandExecutor(StatefulPlugin):
     def _execute_commands(self, metrics_to_collect: List[MetricDefinition]):
         """
         Executes the commands of all metrics.
+
+        The commands are independent and mostly wait for their subprocesses,
+        so several commands are executed in parallel threads.
         """
         unique_commands = self._determine_unique_commands(metrics_to_collect)
         self.command_results.clear()
-        for command in unique_commands:
-            try:
-                result = CommandExecutor.run_command(command)
-                self.command_results[command] = result
-            except BashCommandFailedException:
-                self.command_results[command] = None  # Command failed, assign None
+        if len(unique_commands) <= 1:
+            for command in unique_commands:
+                self.command_results[command] = CommandExecutor._run_command_or_none(command)
+            return
+
+        if self._pool is None:
+            # Sized for every command to run at once when all the groups are executed together
+            max_workers = len(self._determine_unique_commands(self.metrics.values()))
+            self._pool = ThreadPoolExecutor(max_workers=max_workers)
+
+        results = self._pool.map(CommandExecutor._run_command_or_none, unique_commands)
+        self.command_results.update(zip(unique_commands, results))
+
+    @staticmethod
+    def _run_command_or_none(command: str):
+        try:
+            return CommandExecutor.run_command(command)
+        except BashCommandFailedException:
+            return None  # Command failed, assign None
 
     def _parse_outputs(self, metrics_to_collect):
         """
@@ -161,6 +190,10 @@ class CommandExecutor(StatefulPlugin):
             self.timeseries[metric_definition.name].append(value)
 
     def on_end(self) -> Dict:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
         report = {}
         for timeseries in self.timeseries.values():
             timeseries_report = self._compose_report_for_metric(timeseries)
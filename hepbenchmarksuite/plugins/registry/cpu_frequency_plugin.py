@@ -1,7 +1,6 @@
 """CPU frequency plugin module."""
 
 import os
-from statistics import mean
 
 from hepbenchmarksuite.plugins.registry.timeseries_collector_plugin import TimeseriesCollectorPlugin
 
@@ -13,32 +12,39 @@ class CPUFrequencyPlugin(TimeseriesCollectorPlugin):
         super().__init__('cpu-frequency', interval_mins, 'kHz')
         
         cpu_base_path = '/sys/devices/system/cpu/'
-        self.cpu_directories = [
-            d for d in os.listdir(cpu_base_path) if d.startswith('cpu') and d[3:].isdigit()
-        ]
+        with os.scandir(cpu_base_path) as entries:
+            self.cpu_directories = [
+                entry.name for entry in entries if entry.name.startswith('cpu') and entry.name[3:].isdigit()
+            ]
 
         if len(self.cpu_directories) == 0:
             raise RuntimeError('No CPUs found in /sys/devices/system/cpu/')
 
+        # The paths are built and encoded once, they are read at every interval
+        self.freq_paths = [
+            os.fsencode(os.path.join(cpu_base_path, cpu_dir, 'cpufreq', 'scaling_cur_freq'))
+            for cpu_dir in self.cpu_directories
+        ]
+
     def execute(self) -> None:
         """
         Collects the current CPU frequencies and appends them to the timeseries data.
         """
-        frequencies = []
-        for cpu_dir in self.cpu_directories:
-            freq_path = f'/sys/devices/system/cpu/{cpu_dir}/cpufreq/scaling_cur_freq'
+        total_freq = 0
+        count = 0
+        for freq_path in self.freq_paths:
             try:
-                with open(freq_path, 'r', encoding='utf-8') as freq_file:
-                    scaling_cur_freq = int(freq_file.read().strip())
-                frequencies.append(scaling_cur_freq)
+                # Raw read of the few bytes of the value, without a buffered text file object
+                total_freq += int(self._read_proc_bytes(freq_path, 32))
+                count += 1
             except FileNotFoundError:
-                print(f"Warning: {freq_path} not found.")
+                print(f"Warning: {os.fsdecode(freq_path)} not found.")
             except ValueError:
-                print(f"Warning: Invalid value in {freq_path}.")
+                print(f"Warning: Invalid value in {os.fsdecode(freq_path)}.")
             except PermissionError:
-                print(f"Warning: Permission denied accessing {freq_path}.")
+                print(f"Warning: Permission denied accessing {os.fsdecode(freq_path)}.")
 
-        if frequencies:
-            self.timeseries.append(mean(frequencies))
+        if count:
+            self.timeseries.append(total_freq / count)
         else:
             print("Warning: No CPU frequencies were appended due to earlier errors.")
@@ -1,5 +1,5 @@
+import time
 from abc import abstractmethod
-from datetime import datetime
 from multiprocessing import Event
 
 from hepbenchmarksuite.plugins.stateful_plugin import StatefulPlugin
@@ -16,7 +16,7 @@ class IntervalPlugin(StatefulPlugin):
         self.interval_secs = interval_mins * seconds_per_minute
 
     def run(self, stop_event: Event):
-        start_time = datetime.now()
+        start_time = time.monotonic()
 
         # Run immediately after start up
         self.execute()
@@ -31,8 +31,7 @@ class IntervalPlugin(StatefulPlugin):
             time_until_next_execution = self._determine_time_until_next_execution(start_time)
 
     def _determine_time_until_next_execution(self, start_time):
-        time_now = datetime.now()
-        time_elapsed_this_round = (time_now - start_time).total_seconds() % self.interval_secs
+        time_elapsed_this_round = (time.monotonic() - start_time) % self.interval_secs
         time_until_next_execution = self.interval_secs - time_elapsed_this_round
         return time_until_next_execution
 
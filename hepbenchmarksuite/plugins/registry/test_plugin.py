@@ -18,9 +18,13 @@ class TestPlugin(StatefulPlugin):
         """
         Runs until the stop signal is received.
         """
+        # The counter is kept in a local while looping and stored once at the end
+        counter = self.counter
         while not stop_event.is_set():
-            self.counter += 1
+            counter += 1
+            # Yields the GIL to the other plugin threads
             sleep(0)
+        self.counter = counter
 
     def on_end(self) -> Dict:
         """
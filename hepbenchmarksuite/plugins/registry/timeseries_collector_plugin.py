@@ -1,3 +1,4 @@
+import os
 from abc import ABC
 from typing import Dict
 
@@ -11,12 +12,38 @@ class TimeseriesCollectorPlugin(IntervalPlugin, ABC):
         super().__init__(interval_mins)
         self.unit = unit
         self.timeseries = Timeseries(name)
+        # Descriptors of the procfs/sysfs files read by the plugin, keyed by path
+        self._open_fds = {}
 
     def on_start(self) -> None:
         self.timeseries.clear()
 
     def on_end(self) -> Dict:
+        for fd in self._open_fds.values():
+            os.close(fd)
+        self._open_fds.clear()
+
         report = self.timeseries.create_report()
         report['unit'] = self.unit
         report['interval'] = self.interval_secs
         return report
+
+    def _read_proc_bytes(self, path: bytes, size: int) -> bytes:
+        """
+        Reads up to `size` bytes of a procfs/sysfs file without spawning a process.
+
+        The file is opened on its first read and stays open until the plugin ends,
+        procfs and sysfs regenerate the content on every read from offset 0.
+        """
+        fd = self._open_fds.get(path)
+        if fd is not None:
+            try:
+                return os.pread(fd, size, 0)
+            except OSError:
+                # e.g. the device went offline, open the file again
+                os.close(fd)
+                del self._open_fds[path]
+
+        fd = os.open(path, os.O_RDONLY)
+        self._open_fds[path] = fd
+        return os.pread(fd, size, 0)
@@ -7,8 +7,14 @@
 """
 import json
 import logging
+from functools import lru_cache
 from pathlib import Path
-from opensearchpy import OpenSearch
+
+# orjson is an optional, faster JSON encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 _log = logging.getLogger(__name__)
 
@@ -20,8 +26,44 @@ PASSWORD = "password"
 INDEX = "index"
 
 
+@lru_cache(maxsize=None)
+def _get_orjson_serializer_class():
+    """Returns the orjson serializer, defined on first use as opensearch-py is only
+    loaded when results are sent to a cluster."""
+    from opensearchpy.serializer import JSONSerializer
+
+    class ORJSONSerializer(JSONSerializer):
+        """Serializes the request bodies with orjson, NaN values are written as null.
+
+        orjson handles the datetime, UUID and NumPy types natively, the other
+        types are left to the serializer of opensearch-py.
+        """
+
+        def dumps(self, data):
+            # don't serialize strings
+            if isinstance(data, str):
+                return data
+
+            try:
+                # opensearch-py expects str, e.g. the bulk helpers join the bodies with "\n"
+                return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+            except TypeError:
+                return super().dumps(data)
+
+        def loads(self, s):
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                return super().loads(s)
+
+    return ORJSONSerializer
+
+
 class Elastic():
     def __init__(self, conf):
+        # opensearch-py is only loaded when results are sent to a cluster
+        from opensearchpy import OpenSearch
+
         conn = {"hosts": [{"host": conf[SERVER], "port": conf[PORT]}]}
         use_ssl = False
 
@@ -30,6 +72,9 @@ class Elastic():
             conn = {**conn, "http_auth": (conf[USERNAME], conf[PASSWORD])}
             use_ssl = True
 
+        if orjson is not None:
+            conn = {**conn, "serializer": _get_orjson_serializer_class()()}
+
         self.opensearch = OpenSearch(
                 **conn,
                 use_ssl=use_ssl,
@@ -46,7 +91,9 @@ class Elastic():
         msg = {"message": msg, "@timestamp": timestamp}
         _log.info("document after formatting: %s", msg)
 
-        response = self.opensearch.index(index=index, body=msg, refresh=True, id=_id)
+        # The request returns once the document is searchable, waiting for the next
+        # periodic refresh of the index instead of forcing one for every document
+        response = self.opensearch.index(index=index, body=msg, id=_id, refresh="wait_for")
         _log.debug(response)
         return response
 
@@ -60,6 +107,12 @@ class Elastic():
         return response
 
 
+@lru_cache(maxsize=None)
+def _get_elastic(server, port, username=None, password=None):
+    """Returns a client per cluster and credentials, its connections are kept alive between sends"""
+    return Elastic({SERVER: server, PORT: port, USERNAME: username, PASSWORD: password})
+
+
 def send_message(filepath, connection):
     """Expects a filepath string, and a dict of args"""
 
@@ -72,11 +125,14 @@ def send_message(filepath, connection):
     if not connection.get(INDEX) or not connection.get(PORT) or not connection.get(SERVER):
         raise ValueError(f"The following parameters are mandatory: {PORT}, {SERVER}, {INDEX}")
 
-    index = connection.pop(INDEX)
+    # The connection is not modified, it is reused for the next reports
+    index = connection[INDEX]
     _log.debug("Using index %s", index)
     try:
         _log.debug("Attempting send of message %s", message)
-        res = Elastic(connection).send(index, message)
+        elastic = _get_elastic(connection[SERVER], connection[PORT],
+                               connection.get(USERNAME), connection.get(PASSWORD))
+        res = elastic.send(index, message)
     except Exception as e:
         raise Exception(f"An error occured while sending a message to index {index}: {e}") from e
 
@@ -94,10 +150,13 @@ def retrieve_document(connection):
     if not connection.get(INDEX) or not connection.get(PORT) or not connection.get(SERVER):
         raise ValueError(f"The following parameters are mandatory: {PORT}, {SERVER}, {INDEX}")
 
-    index = connection.pop(INDEX)
+    # The connection is not modified, as in send_message
+    index = connection[INDEX]
     _log.debug("Using index %s", index)
     try:
-        res = Elastic(connection).search(index)
+        elastic = _get_elastic(connection[SERVER], connection[PORT],
+                               connection.get(USERNAME), connection.get(PASSWORD))
+        res = elastic.search(index)
         _log.debug("Query result: %s", res)
     except Exception as e:
         raise Exception(f"An error occured while querying OpenSearch index {index}: {e}") from e
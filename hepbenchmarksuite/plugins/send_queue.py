@@ -8,22 +8,18 @@
 
 import argparse
 import logging
+import re
 import stomp
 import sys
-import time
-import pem
-import requests
-import tarfile
+import threading
+import uuid
 
 import os
-from os import listdir, makedirs
-from os.path import join, isfile, dirname, realpath, exists
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from os import makedirs
+from os.path import join, dirname, normpath, realpath, exists
 
-import subprocess
-from subprocess import DEVNULL, STDOUT
-
-from OpenSSL import SSL, crypto
-from bs4 import BeautifulSoup
 from pathlib import Path
 
 
@@ -33,6 +29,10 @@ CA_DIR = join(dirname(realpath(__file__)), "CA")
 CA_URL = "https://repository.egi.eu/sw/production/cas/1/current/tgz/"  # CAs included in ca-policy-egi-core
 CA_EXTRA = {"geant_personal_ca_4.pem": "https://services.renater.fr/_media/tcs/geant_personal_ca_4.pem",  # Extra CAs
             "USERTrust_RSA_Certification_Authority.pem": "https://crt.sh/?d=1199354"}
+# Number of CA files downloaded at the same time
+CA_DOWNLOAD_WORKERS = 8
+# Links to the tarballs in the HTML index of CA_URL
+_REG_TARBALL_HREF = re.compile(r'<a\s[^>]*?href\s*=\s*["\']([^"\']+\.tar\.gz)["\']', re.IGNORECASE)
 
 # Parameters
 PORT = "port"
@@ -45,6 +45,9 @@ KEY = "key"
 VERIFY_CERT = "verify_cert"
 FILE = "file"
 
+# Seconds to wait for the broker to acknowledge a sent message
+RECEIPT_TIMEOUT = 5
+
 
 class Listener(stomp.ConnectionListener):
     """A generic STOMP protocol listener
@@ -56,11 +59,18 @@ class Listener(stomp.ConnectionListener):
         self.conn = conn
         self.status = True
         self.message = ""
+        # Set once the broker answers a frame sent with a receipt header, or with an error
+        self.answered = threading.Event()
 
     def on_error(self, frame):
         _log.error("received error: %s", frame.body)
         self.status = False
         self.message = frame.body
+        self.answered.set()
+
+    def on_receipt(self, frame):
+        _log.debug("received receipt: %s", frame.headers.get("receipt-id"))
+        self.answered.set()
 
     def on_message(self, frame):
         _log.error("received message: %s", frame.body)
@@ -74,65 +84,119 @@ def _check_certificate_config(connection):
     _validate_certificate(cert, verify)
 
 
-def _ensure_key_matches_cert(cert, connection, key):
+@lru_cache(maxsize=32)
+def _get_ssl_context(cert, key):
+    """ Returns a context holding the certificate and its private key, which are checked to match.
+
+    The context is cached per loaded certificate and key, see _load_cert_and_key. """
+    from OpenSSL import SSL
+
     context = SSL.Context(SSL.TLS_METHOD)
     context.use_privatekey(key)
     context.use_certificate(cert)
+    context.check_privatekey()
+    return context
+
+
+def _ensure_key_matches_cert(cert, connection, key):
+    from OpenSSL import SSL
+
     try:
-        context.check_privatekey()
+        _get_ssl_context(cert, key)
     except SSL.Error:
         raise Exception(f"Certificate {connection[CERTIFICATE]} and private key {connection[KEY]} do not match")
 
 
+def _download_ca_tarball(session, url):
+    """ Downloads a tarball of CA certificates and extracts its files into CA_DIR.
+
+    Returns the contents of the .pem files extracted at the top of CA_DIR, in archive order. """
+    import tarfile
+
+    contents = []
+    # The archive is extracted while it is downloaded, without storing it in memory or on disk
+    with session.get(url, stream=True, timeout=60) as data:
+        data.raw.decode_content = True
+        with tarfile.open(fileobj=data.raw, mode="r|gz") as tar:
+            for member in tar:
+                if member.isreg():
+                    tar.extract(member, CA_DIR)
+                    # Only the certificates at the top of CA_DIR are trusted
+                    if member.name.endswith(".pem") and not dirname(normpath(member.name)):
+                        # The stream cannot be rewound, the file is read back from the page cache
+                        with open(join(CA_DIR, member.name), "rb") as f:
+                            contents.append(f.read())
+    return contents
+
+
+def _download_ca_file(session, name, url):
+    """ Downloads a single CA certificate into CA_DIR and returns its contents. """
+    data = session.get(url, timeout=60)
+    with open(join(CA_DIR, name), "wb") as f:
+        f.write(data.content)
+    return data.content
+
+
 def download_ca_certificates():
+    """ Downloads the CA certificates into CA_DIR.
+
+    Returns the contents of the downloaded certificates, so that they do not
+    have to be read again from CA_DIR. """
+    import requests
+
     if not exists(CA_DIR):
         makedirs(CA_DIR)
 
-    # Download ca-policy-egi-core compressed CA certificates
-    data = requests.get(CA_URL, timeout=60)
-    html = BeautifulSoup(data.text, "html.parser")
+    # The connections to the CA repository are kept alive and reused by all the downloads
+    with requests.Session() as session:
+        # Download ca-policy-egi-core compressed CA certificates
+        data = session.get(CA_URL, timeout=60)
+        tarball_urls = [CA_URL + href for href in _REG_TARBALL_HREF.findall(data.text)]
+
+        # The tarballs and the extra CAs are downloaded concurrently
+        with ThreadPoolExecutor(max_workers=CA_DOWNLOAD_WORKERS) as executor:
+            futures = [executor.submit(_download_ca_tarball, session, url) for url in tarball_urls]
+            futures += [executor.submit(_download_ca_file, session, name, url) for name, url in CA_EXTRA.items()]
+            # Raise the first download error, if any. The futures are collected in
+            # submission order, so the same certificates give the same contents
+            contents = []
+            for future in futures[:len(tarball_urls)]:
+                contents.extend(future.result())
+            for future in futures[len(tarball_urls):]:
+                contents.append(future.result())
 
-    for link in html.find_all("a"):
-        if link.get("href").endswith(".tar.gz"):
-            data = requests.get(CA_URL + link["href"], timeout=60)
+    return tuple(contents)
 
-            with open(join(CA_DIR, link["href"]), "wb") as f:
-                f.write(data.content)
 
-    # Extract all tar.gz files
-    compressed_files = [join(CA_DIR, f) for f in listdir(CA_DIR) if isfile(join(CA_DIR, f)) and f.endswith(".tar.gz")]
-    for file in compressed_files:
-        tar = tarfile.open(file, "r:gz")
+def _build_ca_store(ca_contents):
+    """ Builds the store of the given CA certificates. """
+    import pem
+    from OpenSSL import crypto
 
-        for member in tar.getmembers():
-            if member.isreg():
-                tar.extract(member, CA_DIR)
+    store = crypto.X509Store()
+    for content in ca_contents:
+        for _ca in pem.parse(content):
+            crt = crypto.load_certificate(crypto.FILETYPE_PEM, _ca.as_bytes())
+            store.add_cert(crt)
+    return store
 
-        tar.close()
-        os.remove(file)
 
-    # Download extra CAs
-    for name, url in CA_EXTRA.items():
-        data = requests.get(url, timeout=60)
-        with open(join(CA_DIR, name), "wb") as f:
-            f.write(data.content)
+@lru_cache(maxsize=1)
+def _get_ca_store():
+    """ Downloads the CA certificates and builds their store, once per process. """
+    return _build_ca_store(download_ca_certificates())
 
 
 def _validate_certificate(cert, verify=False):
     """ The certificate is validated against CA certificates, and other checks are performed.
     E.g. that the certificate is not expired. """
-
-    store = crypto.X509Store()
+    from OpenSSL import crypto
 
     if verify:
         _log.info("Validating certificate's signature against CA certificates")
-        download_ca_certificates()
-
-        certificates = [join(CA_DIR, f) for f in listdir(CA_DIR) if isfile(join(CA_DIR, f)) and f.endswith(".pem")]
-        for file in certificates:
-            for _ca in pem.parse_file(join(CA_DIR, file)):
-                crt = crypto.load_certificate(crypto.FILETYPE_PEM, _ca.as_bytes())
-                store.add_cert(crt)
+        store = _get_ca_store()
+    else:
+        store = crypto.X509Store()
 
     store_ctx = crypto.X509StoreContext(store, cert)
 
@@ -146,39 +210,96 @@ def _validate_certificate(cert, verify=False):
             raise ValueError(f"An error occurred while validating your certificate: {e}")
 
 
+def _file_version(path):
+    """ Identifies the version of a file by its path, modification time and size. """
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
 def _load_cert_and_key(connection):
+    return _load_cert_and_key_files(_file_version(connection[CERTIFICATE]), _file_version(connection[KEY]))
+
+
+@lru_cache(maxsize=32)
+def _load_cert_and_key_files(cert_version, key_version):
+    """ Loads the certificate and the private key, they are read again only when the files change. """
+    from OpenSSL import crypto
+
+    cert_file, key_file = cert_version[0], key_version[0]
+
     # TODO: Check for other file types
     try:
-        cert = crypto.load_certificate(crypto.FILETYPE_PEM, open(connection[CERTIFICATE], 'rb').read())
+        with open(cert_file, 'rb') as f:
+            cert = crypto.load_certificate(crypto.FILETYPE_PEM, f.read())
     except crypto.Error as e:
-        raise Exception(f"Error while loading the certificate {connection[CERTIFICATE]}: {e}")
+        raise Exception(f"Error while loading the certificate {cert_file}: {e}")
 
     try:
-        key = crypto.load_privatekey(crypto.FILETYPE_PEM, open(connection[KEY]).read())
+        with open(key_file) as f:
+            key = crypto.load_privatekey(crypto.FILETYPE_PEM, f.read())
     except crypto.Error as e:
-        raise Exception(f"Error while loading the private key {connection[KEY]}: {e}")
+        raise Exception(f"Error while loading the private key {key_file}: {e}")
 
     return cert, key
 
 
 def is_key_password_protected(key):
-    os.chmod(key, 0o600)
-    return_code = subprocess.run(["ssh-keygen", "-y", "-P", "''", "-f", key], stdout=DEVNULL, stderr=STDOUT).returncode
-    return return_code != 0
+    """ The key is protected if it cannot be loaded with an empty passphrase. """
+    from OpenSSL import crypto
 
+    with open(key, "rb") as f:
+        key_contents = f.read()
+
+    try:
+        crypto.load_privatekey(crypto.FILETYPE_PEM, key_contents, passphrase=b"")
+    except crypto.Error:
+        return True
+    return False
 
-def send_message(filepath, connection):
-    """Expects a filepath string, and a dict of args"""
 
-    if not Path(filepath).is_file():
-        raise FileNotFoundError(f"{filepath} is not a valid filepath!")
+def _read_report(filepath):
+    """ The report is sent as read, stomp.py would encode a decoded str back to bytes. """
+    with open(filepath, "rb") as f:
+        return f.read()
+
+
+def _check_send_parameters(filepaths, connection):
+    """ The reports must exist and the broker parameters must be set before connecting. """
+    for filepath in filepaths:
+        if not Path(filepath).is_file():
+            raise FileNotFoundError(f"{filepath} is not a valid filepath!")
 
     if not connection.get(PORT) or not connection.get(SERVER) or not connection.get(TOPIC):
         raise ValueError(f"The following parameters are mandatory: {PORT}, {SERVER}, {TOPIC}")
 
-    with open(filepath, "r", encoding="utf-8") as f:
-        message_contents = f.read()
 
+def send_message(filepath, connection):
+    """Expects a filepath string, and a dict of args"""
+    _check_send_parameters([filepath], connection)
+
+    # The single report is read before connecting, an unreadable report raises its own error
+    message_contents = _read_report(filepath)
+
+    if not _send_reports([(filepath, lambda: message_contents)], connection):
+        raise Exception(f"ERROR: {filepath} could not be sent")
+
+
+def send_messages(filepaths, connection):
+    """Expects a list of filepath strings, and a dict of args.
+    The files are sent over a single connection to the broker, a file that
+    fails to be sent is logged and skipped.
+
+    Returns the list of filepaths acknowledged by the broker."""
+    _check_send_parameters(filepaths, connection)
+
+    # Each report is only read just before it is sent
+    return _send_reports([(filepath, partial(_read_report, filepath)) for filepath in filepaths], connection)
+
+
+def _send_reports(reports, connection):
+    """Sends the (filepath, read) pairs of `reports`, `read` returning the report contents.
+
+    Returns the list of filepaths acknowledged by the broker."""
     conn = stomp.Connection(host_and_ports=[(connection[SERVER], int(connection[PORT]))])
     conn.set_listener("mylistener", Listener(conn))
 
@@ -193,28 +314,51 @@ def send_message(filepath, connection):
             key_file=connection[KEY],
             ssl_version=5,
         )  # <_SSLMethod.PROTOCOL_TLSv1_2: 5>
-        conn.connect(wait=True)
+        credentials = ()
         _log.info("AMQ SSL: certificate based authentication")
     elif USERNAME in connection and PASSWORD in connection:
-        conn.connect(connection[USERNAME], connection[PASSWORD], wait=True)
+        credentials = (connection[USERNAME], connection[PASSWORD])
         _log.info("AMQ Plain: user-password based authentication")
     else:
         raise IOError(
             "The input arguments do not include a valid pair of authentication (certificate, key) or (user, password)"
         )
+    conn.connect(*credentials, wait=True)
 
     _log.info("Sending results to AMQ topic")
-    time.sleep(5)
-    _log.debug("Attempting send of message %s", message_contents)
-    conn.send(connection[TOPIC], message_contents, "application/json")
-
-    time.sleep(5)
-
-    if conn.get_listener("mylistener").status is False:
-        raise Exception("ERROR: {}".format(conn.get_listener("mylistener").message))
-    conn.disconnect()
+    listener = conn.get_listener("mylistener")
+    sent = []
+    for filepath, read in reports:
+        try:
+            # The broker closes the connection after answering with an ERROR frame
+            if not conn.is_connected():
+                conn.connect(*credentials, wait=True)
+
+            message_contents = read()
+
+            _log.debug("Attempting send of message %s", message_contents)
+            # connect(wait=True) returns once the broker has accepted the connection,
+            # the broker then acknowledges each message with a RECEIPT or an ERROR frame
+            listener.status = True
+            listener.answered.clear()
+            conn.send(connection[TOPIC], message_contents, "application/json", headers={"receipt": str(uuid.uuid4())})
+
+            # A message without a RECEIPT is not known to be delivered, it counts as failed
+            if not listener.answered.wait(timeout=RECEIPT_TIMEOUT):
+                raise TimeoutError(f"The broker did not acknowledge the message within {RECEIPT_TIMEOUT} seconds")
+
+            if listener.status is False:
+                raise Exception("ERROR: {}".format(listener.message))
+        except Exception as err:
+            _log.error("%s could not be sent: %s", filepath, err)
+            continue
+        sent.append(filepath)
+
+    if conn.is_connected():
+        conn.disconnect()
 
     _log.info("Results sent to AMQ topic")
+    return sent
 
 
 def parse_args(args):
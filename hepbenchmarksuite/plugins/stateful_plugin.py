@@ -1,4 +1,5 @@
 import multiprocessing as mp
+import queue
 import traceback
 from abc import ABC, abstractmethod
 from multiprocessing import Event
@@ -52,11 +53,13 @@ class StatefulPlugin(ABC):
 
         It cannot be called while the plugin is still running.
         """
-        if self.queue.empty():
+        # A single non-blocking get, checking empty() first would cost another round-trip
+        # to the manager process and the queue could change in between
+        try:
+            return self.queue.get(block=False)
+        except queue.Empty:
             raise PluginAssertError('No results available: Cannot retrieve the result of a plugin when '
-                                    'the plugin is still running or has not been started.')
-
-        return self.queue.get()
+                                    'the plugin is still running or has not been started.') from None
 
     def on_start(self) -> None:
         """
@@ -15,25 +15,37 @@ class Timeseries:
 
     def __init__(self, name: str, statistics: Optional[str] = 'default'):
         self.name = name
-        self.values = {}
+        # Timestamps are kept as datetime objects and only formatted when read,
+        # appending a value does not go through strftime
+        self._timestamps = []
+        self._values = []
         self.statistics = statistics
 
+    @staticmethod
+    def _format_timestamp(timestamp: datetime) -> str:
+        # Same as strftime("%Y-%m-%dT%H:%M:%S.%fZ"), without parsing the format
+        return timestamp.isoformat(timespec='microseconds') + 'Z'
+
+    @property
+    def values(self) -> Dict:
+        return self.get_values()
+
     def get_name(self) -> str:
         return self.name
 
     def get_values(self) -> Dict:
-        return self.values
+        return dict(zip(map(self._format_timestamp, self._timestamps), self._values))
 
     def get_last(self):
-        return list(self.values.values())[-1]
+        return self._values[-1]
 
     def clear(self) -> None:
-        self.values.clear()
+        self._timestamps.clear()
+        self._values.clear()
 
     def append(self, value: Any) -> None:
-        timestamp_utc = datetime.utcnow()
-        timestamp_utc_string = timestamp_utc.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-        self.values[timestamp_utc_string] = value
+        self._timestamps.append(datetime.utcnow())
+        self._values.append(value)
 
     def calculate_statistics(self) -> Dict[str, float]:
         """
@@ -41,7 +53,7 @@ class Timeseries:
         Handles user-specified statistics or defaults to a predefined set.
         """
         # Convert values to a NumPy array and filter out NaN values
-        timeseries_array = np.array(list(self.values.values()))
+        timeseries_array = np.array(self._values)
         valid_values = timeseries_array[~np.isnan(timeseries_array)]
 
         # Return an empty dictionary if no data is present
@@ -59,8 +71,8 @@ class Timeseries:
                 'median': math.nan,
             }
 
-        # Predefined statistical functions
-        predefined_stats = {'min': np.min, 'mean': np.mean, 'median': np.median, 'max': np.max}
+        # Predefined statistical functions, the median is computed with the quantiles
+        predefined_stats = {'min': np.min, 'mean': np.mean, 'max': np.max}
 
         # Determine the list of statistics to compute (default or user-specified)
         statistics_list = (
@@ -69,27 +81,40 @@ class Timeseries:
             else [stat.strip() for stat in self.statistics.split(',') if stat.strip()]
         )
 
-        # Initialize result with basic counts
-        result = {'total_count': len(timeseries_array), 'valid_count': len(valid_values)}
-
-        # Compute statistics
+        # Collect the requested quantiles, they are all computed in a single call
+        quantiles = {}
         for stat in statistics_list:
             if stat in predefined_stats:
-                # Calculate predefined statistics
-                result[stat] = predefined_stats[stat](valid_values) if len(valid_values) > 0 else math.nan
+                continue
+            if stat == 'median':
+                quantiles[stat] = 0.5
             elif stat.startswith('q'):
-                # Calculate quantile-based statistics
+                # Parse quantile-based statistics
                 try:
                     quantile_str = stat[1:]
                     quantile = float(quantile_str) / 100.0
                     if not (0 <= quantile <= 1):
                         raise ValueError(f"Quantile '{quantile_str}' is out of bounds. Must be between q0 and q100.")
-                    result[stat] = np.quantile(valid_values, quantile)
+                    quantiles[stat] = quantile
                 except ValueError:
                     raise ValueError(f"Invalid quantile value: '{stat}'. Must be a valid number between q0 and q100.")
             else:
                 # Raise an error for unsupported statistics
                 raise ValueError(f"Statistic '{stat}' not supported.")
+
+        quantile_values = {}
+        if quantiles:
+            quantile_values = dict(zip(quantiles, np.quantile(valid_values, list(quantiles.values()))))
+
+        # Initialize result with basic counts
+        result = {'total_count': len(timeseries_array), 'valid_count': len(valid_values)}
+
+        # Compute statistics
+        for stat in statistics_list:
+            if stat in predefined_stats:
+                result[stat] = predefined_stats[stat](valid_values)
+            else:
+                result[stat] = quantile_values[stat]
         
         return result
 
@@ -98,7 +123,7 @@ class Timeseries:
         Generates a report summarizing the time series data, including statistics,
         start and end timestamps, and the list of values.
         """
-        if not self.values:  # Handle empty Timeseries
+        if not self._values:  # Handle empty Timeseries
             return {
                 'start_time': None,
                 'end_time': None,
@@ -107,17 +132,15 @@ class Timeseries:
             }
 
         statistics = self.calculate_statistics()
-        timestamps = list(self.get_values().keys())
-        values = list(self.get_values().values())
 
         # Extract start and end times
-        start_time = timestamps[0]
-        end_time = timestamps[-1]
+        start_time = self._format_timestamp(self._timestamps[0])
+        end_time = self._format_timestamp(self._timestamps[-1])
 
         # Build and return the report
         return {
             'start_time': start_time,
             'end_time': end_time,
-            'values': values,
+            'values': list(self._values),
             'statistics': statistics
         }
@@ -6,8 +6,10 @@
 ###############################################################################
 """
 
+import functools
 import json
 import logging
+import math
 import os
 import shlex
 import socket
@@ -22,8 +24,17 @@ from requests import RequestException
 
 from hepbenchmarksuite import __version__
 
+# orjson is an optional, faster JSON encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 _log = logging.getLogger(__name__)
 
+# Semicolons outside of quotes separate the commands of run_separated_commands
+_REG_COMMAND_SEPARATOR = re.compile(r';(?=(?:[^\'"]*[\'"][^\'"]*[\'"])*[^\'"]*$)')
+
 
 def download_file(url, outfile):
     """Download file from an url and save it locally.
@@ -128,11 +139,14 @@ def exec_live_output(cmd_str, env=None):
     return cmd.returncode
 
 
-def exec_cmd(cmd_str, env=None):
+def exec_cmd(cmd_str, env=None, timeout=None):
     """Execute a command string and return its output and return code.
 
     Args:
-      cmd_str: A string with the command to execute.
+      cmd_str: A string with the command to execute, commands can be chained with '|'.
+               An argument list or tuple (e.g. ['lscpu']) is executed as a single command
+               without any splitting, which is preferred for non-piped commands.
+      timeout: Seconds after which each command is killed and considered failed.
 
     Returns:
       A string with the output and an integer with the return code.
@@ -140,7 +154,7 @@ def exec_cmd(cmd_str, env=None):
 
     _log.debug("Executing command: %s, with environment: %s",
                 cmd_str, "default" if env is None else env)
-    return_code, reply, error = run_piped_commands(cmd_str, env)
+    return_code, reply, error = run_piped_commands(cmd_str, env, timeout)
 
     # Check for errors
     if return_code != 0:
@@ -154,30 +168,38 @@ def exec_cmd(cmd_str, env=None):
     return reply, return_code
 
 
-def run_piped_commands(cmd_str, env=None):
-    """Exec a command chain"""
+def run_piped_commands(cmd_str, env=None, timeout=None):
+    """Exec a command chain.
+
+    A string is split on '|' into piped commands, an argument list or tuple is executed as a single command.
+    """
 
-    # Split the command string into a list of individual commands
-    commands = cmd_str.split("|")
+    # Split the command string into the argument lists of the individual commands
+    commands = [list(cmd_str)] if isinstance(cmd_str, (list, tuple)) else split_piped_commands(cmd_str)
 
-    # Use subprocess.run() to execute the piped commands
+    # Use subprocess.run() to execute the piped commands.
+    # File descriptors are non-inheritable by default (PEP 446), so keeping close_fds=False
+    # is safe and allows CPython to spawn the children with posix_spawn instead of fork+exec.
     output = None
-    for cmd in commands:
-        # split command using shlex to handle cases like awk
-        cmd_split = shlex.split(cmd.strip())
+    for cmd_split in commands:
         _log.debug("Executing command: %s, with environment: %s",
                    cmd_split, "default" if env is None else env)
         try:
             if output:
                 out = output.stdout
                 _log.debug("Input: %s", out)
-                output = subprocess.run(cmd_split, input=out, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, env=env)
+                output = subprocess.run(cmd_split, input=out, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                        check=True, env=env, close_fds=False, timeout=timeout)
             else:
                 _log.debug("No input")
-                output = subprocess.run(cmd_split, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, env=env)
+                output = subprocess.run(cmd_split, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                        check=True, env=env, close_fds=False, timeout=timeout)
         except FileNotFoundError as e:
             _log.warning("Command not found: %s", e.filename)
             return None, None, f"Command not found: {e.filename}"
+        except subprocess.TimeoutExpired as e:
+            _log.warning("Command timed out after %s seconds: %s", e.timeout, e.cmd)
+            return None, None, f"Command timed out: {e.cmd}"
         except subprocess.CalledProcessError as e:
             _log.warning("Error executing command: %s | Piped command's return code: %s | Output: %s", e.cmd, e.returncode, e.output.decode(errors='replace').strip() or "-")
             return e.returncode, e.output.decode(errors='replace'), e.stderr.decode(errors='replace')
@@ -192,6 +214,23 @@ def run_piped_commands(cmd_str, env=None):
         return None, None, None
 
 
+@functools.lru_cache(maxsize=128)
+def split_piped_commands(cmd_str):
+    """Split a command string on '|' into the argument lists of the piped commands.
+
+    The plugins run the same commands at every interval, so the result is cached.
+    """
+    # split command using shlex to handle cases like awk
+    return tuple(tuple(shlex.split(cmd.strip())) for cmd in cmd_str.split("|"))
+
+
+@functools.lru_cache(maxsize=128)
+def split_separated_commands(cmd_str):
+    """Split a command string on the semicolons outside of quotes, the result is cached."""
+    commands = _REG_COMMAND_SEPARATOR.split(cmd_str)
+    return tuple(cmd.strip() for cmd in commands if cmd.strip())
+
+
 def run_separated_commands(cmd_str):
     """
     Executes multiple commands delimited by a semicolon (';').
@@ -203,12 +242,8 @@ def run_separated_commands(cmd_str):
     return_code = 0
     error = None
 
-    pattern = re.compile(r';(?=(?:[^\'"]*[\'"][^\'"]*[\'"])*[^\'"]*$)')
-    commands = pattern.split(cmd_str)
-    commands = [cmd.strip() for cmd in commands if cmd.strip()]
-
     outputs = []
-    for cmd in commands:
+    for cmd in split_separated_commands(cmd_str):
         return_code, reply, error = run_piped_commands(cmd)
         if return_code == 0:
             outputs.append(reply)
@@ -317,6 +352,52 @@ def prepare_metadata(full_conf, extra, extractor):
     return result
 
 
+def dump_json(data):
+    """Serialize data to indented JSON with sorted keys.
+
+    orjson is used when installed, the output is the same as with the json module.
+
+    Args:
+      data: A JSON serializable object.
+
+    Returns:
+      The UTF-8 encoded JSON document as bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    return json.dumps(data, indent=2, sort_keys=True, ensure_ascii=False).encode('utf-8')
+
+
+def _nan_to_none(obj):
+    """Replace the NaN floats of a nested structure with None."""
+    if isinstance(obj, dict):
+        return {k: _nan_to_none(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_nan_to_none(v) for v in obj]
+    if isinstance(obj, float) and math.isnan(obj):
+        return None
+    return obj
+
+
+def dump_report_json(data):
+    """Serialize a report to compact JSON, NaN values are written as null.
+
+    orjson is used when installed, it writes NaN as null natively.
+
+    Args:
+      data: A JSON serializable object.
+
+    Returns:
+      The UTF-8 encoded JSON document as bytes.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            _log.debug("Falling back to the json module to serialize the report")
+    return json.dumps(_nan_to_none(data)).encode('utf-8')
+
+
 def print_results(results):
     """Print the results in a human-readable format.
 
@@ -1,4 +1,3 @@
-import datetime
 import time
 import unittest
 from multiprocessing import Event
@@ -85,6 +84,27 @@ class TestCommandExecutor(unittest.TestCase):
         self.assertEqual('', foo_config['unit'])
         self.assertEqual('default', foo_config['aggregation'])
 
+    def test_execute__reuses_thread_pool(self):
+        """
+        The thread pool running different commands is kept between executions,
+        it is shut down when the plugin ends and is not pickled.
+        """
+        metrics = self._get_config()
+        metrics['bar']['command'] = 'other_dummy'
+        executor = CommandExecutor(metrics)
+        CommandExecutor.run_command = MagicMock(return_value="foo=1,bar=2,baz=4")
+
+        executor.execute(list(executor.metrics.values()))
+        pool = executor._pool
+        self.assertIsNotNone(pool)
+        executor.execute(list(executor.metrics.values()))
+        self.assertIs(pool, executor._pool)
+        self.assertIsNone(executor.__getstate__()['_pool'])
+
+        executor.on_end()
+        self.assertIsNone(executor._pool)
+        self.assertEqual(2, executor.timeseries['bar'].get_last())
+
     def test_determine_time_until_next_execution(self):
         """
         Tests that the two metrics with the same execution interval
@@ -92,8 +112,8 @@ class TestCommandExecutor(unittest.TestCase):
         """
         # 0.5 minute until group with the interval of 1 minute
         # 1.5 minute until group with the interval of 5 minutes
-        time_now = datetime.datetime(2023, 1, 1, 0, 3, 30)
-        start_time = datetime.datetime(2023, 1, 1, 0, 0, 0)
+        time_now = 210.0
+        start_time = 0.0
         time_until_next, metrics_to_execute = self.executor._determine_time_until_next_execution(start_time, time_now)
 
         self.assertAlmostEqual(30., time_until_next)
@@ -129,8 +149,8 @@ class TestCommandExecutor(unittest.TestCase):
                 'interval_mins': 1
             }
         })
-        start_time = datetime.datetime(2023, 1, 1, 0, 0, 0)
-        time_now = datetime.datetime(2023, 1, 1, 0, 0, 0)
+        start_time = 0.0
+        time_now = 0.0
         time_until_next, metrics_to_execute = self.executor._determine_time_until_next_execution(start_time, time_now)
 
         self.assertAlmostEqual(self.executor.interval_granularity_secs, time_until_next)
@@ -164,8 +184,8 @@ class TestCommandExecutor(unittest.TestCase):
                 'interval_mins': 5
             }
         })
-        start_time = datetime.datetime(2023, 1, 1, 0, 0, 0)
-        time_now = datetime.datetime(2023, 1, 1, 0, 3, 30)
+        start_time = 0.0
+        time_now = 210.0
         time_until_next, metrics_to_execute = self.executor._determine_time_until_next_execution(start_time, time_now)
 
         self.assertAlmostEqual(30., time_until_next)
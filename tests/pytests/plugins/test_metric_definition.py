@@ -131,6 +131,33 @@ class TestMetricDefinition(unittest.TestCase):
                 else:
                     self.assertEqual(expected_value, value, msg=f"Aggregation '{agg}' failed")
     
+    def test_parse__single_value(self):
+        """
+        A single extracted value is returned as is, except for
+        the aggregations which do not return a sample value.
+        """
+        expected_results = {
+            'average': 10.0,
+            'sum': 10.0,
+            'q75': 10.0,
+            'count': 1,
+        }
+
+        for aggregation, expected in expected_results.items():
+            with self.subTest(aggregation=aggregation):
+                params = {
+                    'command': 'none',
+                    'regex': r'V\d+: (?P<value>\d+).*',
+                    'unit': 'none',
+                    'aggregation': aggregation,
+                    'interval_mins': 1
+                }
+                definition = MetricDefinition('metric', params)
+                self.assertEqual(expected, definition.parse("V1: 10"))
+
+        params['aggregation'] = 'standard_deviation'
+        self.assertTrue(math.isnan(MetricDefinition('metric', params).parse("V1: 10")))
+
     def test_parse__ignores_everything_but_value(self):
         """
         The parsing function extracts a value denoted as "value".
@@ -193,3 +220,16 @@ class TestMetricDefinition(unittest.TestCase):
             MetricDefinition('metric', params)
 
         self.assertRaises(PluginBuilderException, create_instance)
+
+    def test_construction__invalid_regex(self):
+        params = {
+            'command': '',
+            'regex': r'(?P<value>\d+',
+            'unit': '',
+            'interval_mins': 1
+        }
+
+        def create_instance():
+            MetricDefinition('metric', params)
+
+        self.assertRaises(PluginBuilderException, create_instance)
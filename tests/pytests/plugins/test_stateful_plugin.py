@@ -2,6 +2,7 @@ import unittest
 from multiprocessing import Event
 from typing import Any
 
+from hepbenchmarksuite.exceptions import PluginAssertError
 from hepbenchmarksuite.plugins.stateful_plugin import StatefulPlugin
 
 
@@ -44,3 +45,12 @@ class TestStatefulPlugin(unittest.TestCase):
 
         self.assertEqual(1, len(result.keys()))
         self.assertEqual('success', result['status'])
+
+    def test_get_result__raises_without_result(self):
+        plugin = SuccessfulPlugin()
+        self.assertRaises(PluginAssertError, plugin.get_result)
+
+        plugin.start(Event())
+        plugin.get_result()
+        # The result is returned only once
+        self.assertRaises(PluginAssertError, plugin.get_result)
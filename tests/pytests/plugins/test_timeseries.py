@@ -1,5 +1,6 @@
 import unittest
 import math
+from datetime import datetime
 
 from hepbenchmarksuite.plugins.timeseries import Timeseries
 
@@ -177,3 +178,8 @@ class TestTimeseries(unittest.TestCase):
         self.assertEqual({}, report['statistics'])  # Expect empty statistics
         self.assertEqual([], report['values'])  # No values in the report
 
+
+    def test_timestamp_format(self):
+        timestamp = datetime(2024, 2, 21, 13, 57, 5, 42)
+        self.assertEqual('2024-02-21T13:57:05.000042Z', Timeseries._format_timestamp(timestamp))
+        self.assertEqual('2024-02-21T13:57:05.000000Z', Timeseries._format_timestamp(timestamp.replace(microsecond=0)))
@@ -1,5 +1,7 @@
 import multiprocessing as mp
+import os
 import subprocess
+import tempfile
 import time
 import unittest
 from typing import List
@@ -162,3 +164,27 @@ class TestTimeseriesCollectorPlugin(unittest.TestCase):
         # Should contain values of the second run only
         result = self.plugin.get_result()
         self.assertEqual(1, len(result['values']))
+
+    def test_read_proc_bytes(self):
+        """
+        The file is kept open between reads, each read returns its
+        current content and the file is closed when the plugin ends.
+        """
+        plugin = DummyTimeseriesPlugin(1)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.fsencode(os.path.join(tmp_dir, 'value'))
+            with open(path, 'w') as file:
+                file.write('1500000\n')
+
+            plugin.on_start()
+            self.assertEqual(b'1500000\n', plugin._read_proc_bytes(path, 32))
+            fd = plugin._open_fds[path]
+
+            with open(path, 'r+') as file:
+                file.write('2500000\n')
+            self.assertEqual(b'2500000\n', plugin._read_proc_bytes(path, 32))
+            self.assertEqual(fd, plugin._open_fds[path])
+
+            plugin.on_end()
+            self.assertEqual({}, plugin._open_fds)
+            self.assertRaises(OSError, os.fstat, fd)
@@ -9,8 +9,9 @@
 
 import json
 import os
+import tempfile
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, DEFAULT
 from pathlib import Path
 from hepbenchmarksuite.plugins.extractor import Extractor
 from schema import Schema, And, Use, Optional, Or
@@ -62,6 +63,27 @@ class TestHWExtractor(unittest.TestCase):
         if result != "not_available":
             self.assertGreater(int(result), 0)
 
+    def test_parser_kernel(self):
+        """
+        Test the parser for kernel release strings.
+        """
+
+        KERNELS_OK = {
+            "5.14.0-362.8.1.el9_3.x86_64": {"version": "5", "major": "14", "minor": "0", "ABI": "362.8.1"},
+            "3.10.0-1160.el7.x86_64": {"version": "3", "major": "10", "minor": "0", "ABI": "1160"},
+            "6.1.0-13-amd64": {"version": "6", "major": "1", "minor": "0", "ABI": "13"},
+            "6.8.0-generic": {"version": "6", "major": "8", "minor": "0", "ABI": ""},
+            "5.15.0-1009rc-aws": {"version": "5", "major": "15", "minor": "0", "ABI": ""},
+            "5.15.0-362.8.1rc.x86_64": {"version": "5", "major": "15", "minor": "0", "ABI": "362.8"},
+            "6.9.7": {"version": "6", "major": "9", "minor": "7", "ABI": -1},
+            "6.9": {"version": "6", "major": "9", "minor": -1, "ABI": -1},
+            "": {"version": -1, "major": -1, "minor": -1, "ABI": -1},
+        }
+
+        for release, expected in KERNELS_OK.items():
+            with self.subTest(release=release):
+                self.assertEqual(Extractor.get_kernel_parser(release), expected, "Kernel parser mismatch!")
+
     def test_parser_bios(self):
         """
         Test the parser for a BIOS output.
@@ -82,6 +104,79 @@ class TestHWExtractor(unittest.TestCase):
         self.assertEqual(parser("Vendor"), "Intel Corp.", "BIOS parser mismatch!")
         self.assertEqual(parser("Release Date"), "08/22/2013", "BIOS parser mismatch!")
 
+    def test_parser_exact_field_names(self):
+        """
+        Test that the parser matches whole field names only, without
+        interpreting them as regular expressions.
+        """
+
+        hw = Extractor(extra={})
+
+        parser = hw.get_parser(
+            "  BIOS Model name:    Ampere(R) Altra(R) Processor\n"
+            "  Model name:         Neoverse-N1\n"
+            "NUMA node0 CPU(s):    0-79\n"
+            "CPU(s):               160\n"
+            "Flags:\n"
+            "Model:                1\n"
+        )
+
+        self.assertEqual(parser("Model name"), "Neoverse-N1")
+        self.assertEqual(parser("CPU(s)"), "160")
+        self.assertEqual(parser("Flags"), "not_available")
+        self.assertEqual(parser("Model"), "1")
+        self.assertEqual(parser("CPU"), "not_available")
+
+    def test_parser_bmc_fru(self):
+        """
+        Test the parser for an ipmitool fru output.
+        """
+
+        hw = Extractor(extra={})
+
+        with open("tests/data/IPMItool_fru.sample", "r") as fru_file:
+            fru_text = fru_file.read()
+
+        parser = hw.get_parser(fru_text, "BMC")
+
+        self.assertEqual(parser("Product Asset Tag"), ".......", "BMC parser mismatch!")
+        self.assertEqual(parser("Board Serial"), "XYZ1234", "BMC parser mismatch!")
+        self.assertEqual(parser("Board Mfg Date"), "Mon Sep 12 09:16:00 2022", "BMC parser mismatch!")
+        self.assertEqual(parser("Product Serial"), "not_available", "BMC parser mismatch!")
+
+    def test_parser_bios_sysfs(self):
+        """
+        Test that the BIOS fields are read from sysfs and dmidecode is
+        only used for the fields missing in sysfs.
+        """
+
+        with tempfile.TemporaryDirectory() as sysfs_dir:
+            for name, value in (("bios_vendor", "Dell Inc."), ("bios_version", "2.9.3\n")):
+                with open(os.path.join(sysfs_dir, name), "w") as sysfs_file:
+                    sysfs_file.write(value)
+
+            with open("tests/data/BIOS.sample", "r") as bios_file:
+                bios_text = bios_file.read()
+
+            with patch("hepbenchmarksuite.plugins.extractor.SYSFS_DMI_PATH", sysfs_dir):
+                hw = Extractor(extra={})
+                hw._permission = True
+                hw.pkg["dmidecode"] = False
+                self.assertEqual(
+                    hw.collect_bios(),
+                    {"Vendor": "Dell Inc.", "Version": "2.9.3", "Release_data": "not_available"},
+                )
+
+                hw = Extractor(extra={})
+                hw._permission = True
+                hw.pkg["dmidecode"] = True
+                with patch.object(Extractor, "exec_cmd", return_value=bios_text) as mock_exec_cmd:
+                    self.assertEqual(
+                        hw.collect_bios(),
+                        {"Vendor": "Dell Inc.", "Version": "2.9.3", "Release_data": "08/22/2013"},
+                    )
+                    mock_exec_cmd.assert_called_once()
+
     def base_parser_cpu(self, input_to_parse, expected_output):
         hw = Extractor(extra={})
 
@@ -246,16 +341,132 @@ class TestHWExtractor(unittest.TestCase):
 
         self.assertEqual(mem_output, MEM_OK, "Memory parser mismatch!")
 
-    def base_parser_storage(self, input_to_parse, expected_output, lsblk):
+    def test_parser_memory__keeps_slots_aligned(self):
+        """
+        Test that the fields of an empty memory slot are not mixed
+        with the fields of the populated slots.
+        """
+        mem_text = (
+            "Handle 0x1100, DMI type 17, 84 bytes\nMemory Device\n"
+            "\tSize: No Module Installed\n\tType: Unknown\n\tManufacturer: Not Specified\n"
+            "\tPart Number: Not Specified\n\n"
+            "Handle 0x1101, DMI type 17, 84 bytes\nMemory Device\n"
+            "\tSize: 32 GB\n\tType: DDR4\n\tManufacturer: Samsung\n"
+            "\tPart Number: M393A4K40DB3-CWE\n"
+        )
+
+        mem_output = Extractor.get_mem_parser(mem_text)
+
+        self.assertEqual(mem_output, {"dimm1": "32 GB DDR4 | Samsung | M393A4K40DB3-CWE"}, "Memory parser mismatch!")
+
+    def test_parser_memory__skips_placeholders(self):
+        """
+        Test that the slots reporting a placeholder value in any field are skipped.
+        """
+        mem_text = (
+            "Handle 0x1100, DMI type 17, 84 bytes\nMemory Device\n"
+            "\tSize: 8 GB\n\tType: Unknown\n\tManufacturer: NO DIMM\n"
+            "\tPart Number: NO DIMM\n\n"
+            "Handle 0x1101, DMI type 17, 84 bytes\nMemory Device\n"
+            "\tSize: 32 GB\n\tType: DDR4\n\tManufacturer: Samsung\n"
+            "\tPart Number: M393A4K40DB3-CWE\n"
+        )
+
+        mem_output = Extractor.get_mem_parser(mem_text)
+
+        self.assertEqual(mem_output, {"dimm1": "32 GB DDR4 | Samsung | M393A4K40DB3-CWE"}, "Memory parser mismatch!")
+
+    def test_parser_meminfo(self):
+        """
+        Test the parser for a /proc/meminfo output.
+        """
+
+        with open("tests/data/MEMINFO.sample", "r") as meminfo_file:
+            meminfo_text = meminfo_file.read()
+
+        MEM_OK = {
+            "Mem_Total": 263518560,
+            "Mem_Available": 256128628,
+            "Mem_Swap": 4194300,
+        }
+
+        self.assertEqual(Extractor.get_meminfo_parser(meminfo_text), MEM_OK, "Meminfo parser mismatch!")
+
+        MEM_NA = {
+            "Mem_Total": "not_available",
+            "Mem_Available": "not_available",
+            "Mem_Swap": "not_available",
+        }
+
+        self.assertEqual(Extractor.get_meminfo_parser("not_available"), MEM_NA, "Meminfo parser mismatch!")
+
+    def test_parser_microcode(self):
+        """
+        Test the microcode parser for a /proc/cpuinfo output.
+        """
+
+        cpuinfo = (
+            "processor\t: 0\nmicrocode\t: 0xb000040\n\n"
+            "processor\t: 1\nmicrocode\t: 0xb000040\n\n"
+            "processor\t: 2\nmicrocode\t: 0xb000038\n"
+        )
+
+        self.assertEqual(Extractor.get_microcode_parser(cpuinfo.splitlines()), "0xb000040\n0xb000038")
+        self.assertEqual(Extractor.get_microcode_parser(["processor\t: 0"]), "not_available")
+        self.assertEqual(Extractor.read_microcode("non_existing_file"), "not_available")
+
+    def test_read_cpuinfo(self):
+        """
+        Test that only the fields of the first processor are read from /proc/cpuinfo.
+        """
+
+        cpuinfo = (
+            "processor\t: 0\nvendor_id\t: GenuineIntel\ncpu family\t: 6\n"
+            "model name\t: Intel(R) Xeon(R) CPU E5-2630 v3 @ 2.40GHz\nstepping\t: 2\n\n"
+            "processor\t: 1\nvendor_id\t: AuthenticAMD\nstepping\t: 1\n"
+        )
+
+        with tempfile.NamedTemporaryFile("w") as cpuinfo_file:
+            cpuinfo_file.write(cpuinfo)
+            cpuinfo_file.flush()
+            fields = Extractor.read_cpuinfo(cpuinfo_file.name)
+
+        self.assertEqual(fields["vendor_id"], "GenuineIntel", "Cpuinfo parser mismatch!")
+        self.assertEqual(fields["cpu family"], "6", "Cpuinfo parser mismatch!")
+        self.assertEqual(fields["model name"], "Intel(R) Xeon(R) CPU E5-2630 v3 @ 2.40GHz", "Cpuinfo parser mismatch!")
+        self.assertEqual(fields["stepping"], "2", "Cpuinfo parser mismatch!")
+        self.assertEqual(Extractor.read_cpuinfo("non_existing_file"), {})
+
+    def test_parser_dmidecode_types(self):
+        """
+        Test the split of a dmidecode output with several DMI types.
+        """
+
+        hw = Extractor(extra={})
+
+        with open("tests/data/BIOS.sample", "r") as bios_file, open("tests/data/MEM.sample", "r") as mem_file:
+            dmi_text = bios_file.read() + "\n" + mem_file.read()
+
+        records = hw.get_dmi_parser(dmi_text)
+
+        self.assertEqual(len(records[0]), 1, "DMI parser mismatch!")
+        self.assertEqual(records[0][0]["Vendor"], "Intel Corp.", "DMI parser mismatch!")
+        self.assertEqual(records[0][0]["Release Date"], "08/22/2013", "DMI parser mismatch!")
+        self.assertNotIn("Part Number", records[0][0])
+
+        mem_output = hw.get_dimm_parser(records[17])
+        self.assertEqual(len(mem_output), 8, "DMI parser mismatch!")
+        self.assertEqual(mem_output["dimm1"], "8192 MB DDR3 | Nanya | NT8GC72C4NG0NL-CG")
+
+        self.assertEqual(hw.get_dmi_parser("not_available"), {})
+
+    def base_parser_storage(self, input_to_parse, expected_output):
         hw = Extractor(extra={})
 
         with open(input_to_parse, "r") as storage_file:
             storage_text = storage_file.read()
 
-        if lsblk:
-            storage_output = hw.get_storage_parser_lsblk(storage_text)
-        else:
-            storage_output = hw.get_storage_parser(storage_text)
+        storage_output = hw.get_storage_parser(storage_text)
 
         self.assertEqual(storage_output, expected_output, "Storage parser mismatch!")
 
@@ -270,7 +481,7 @@ class TestHWExtractor(unittest.TestCase):
             "disk3": "/dev/sdc | INTEL SSDSC2CW24 | 223GiB (240GB)",
         }
 
-        self.base_parser_storage("tests/data/STORAGE.sample", STORAGE_OK, False)
+        self.base_parser_storage("tests/data/STORAGE.sample", STORAGE_OK)
 
     def test_parser_storage_missing_values(self):
         """
@@ -283,7 +494,7 @@ class TestHWExtractor(unittest.TestCase):
             "disk4": "/dev/nvme1n1 | n/a | 1788GiB (1920GB)",
         }
 
-        self.base_parser_storage("tests/data/STORAGE.sample.2", STORAGE_OK, False)
+        self.base_parser_storage("tests/data/STORAGE.sample.2", STORAGE_OK)
 
     def test_parser_storage_one_disk(self):
         """
@@ -294,7 +505,7 @@ class TestHWExtractor(unittest.TestCase):
             "disk1": "/dev/sda | Samsung SSD 840 | 111GiB (120GB)"
         }
 
-        self.base_parser_storage("tests/data/STORAGE.sample.3", STORAGE_OK, False)
+        self.base_parser_storage("tests/data/STORAGE.sample.3", STORAGE_OK)
 
     def test_parser_storage_missing_value(self):
         """
@@ -305,7 +516,7 @@ class TestHWExtractor(unittest.TestCase):
             "disk1": "/dev/vda | n/a | 100GiB (107GB)"
         }
 
-        self.base_parser_storage("tests/data/STORAGE.sample.4", STORAGE_OK, False)
+        self.base_parser_storage("tests/data/STORAGE.sample.4", STORAGE_OK)
 
     def test_parser_storage_missing_size(self):
         """
@@ -319,7 +530,7 @@ class TestHWExtractor(unittest.TestCase):
             "disk4": "/dev/cdrom | DVD-ROM DV28SV | n/a",
         }
 
-        self.base_parser_storage("tests/data/STORAGE.sample.5", STORAGE_OK, False)
+        self.base_parser_storage("tests/data/STORAGE.sample.5", STORAGE_OK)
 
     def test_parser_storage_seven_disks(self):
         """
@@ -336,7 +547,7 @@ class TestHWExtractor(unittest.TestCase):
             "disk7": "/dev/sdg | PERC H710 | 232GiB (249GB)",
         }
 
-        self.base_parser_storage("tests/data/STORAGE.sample.6", STORAGE_OK, False)
+        self.base_parser_storage("tests/data/STORAGE.sample.6", STORAGE_OK)
 
     def test_parser_storage_two_disks(self):
         """
@@ -348,66 +559,74 @@ class TestHWExtractor(unittest.TestCase):
             "disk2": "/dev/sdb | INTEL SSDSC2BX01 | 1490GiB (1600GB)",
         }
 
-        self.base_parser_storage("tests/data/STORAGE.sample.7", STORAGE_OK, False)
+        self.base_parser_storage("tests/data/STORAGE.sample.7", STORAGE_OK)
 
-    def test_parser_storage_lsblk(self):
+    def test_parser_storage_sysfs(self):
         """
-        Test the parser for a storage output using lsblk
+        Test the storage parser reading the disks from sysfs
         """
 
-        STORAGE_OK = {
-            "disk1": "/dev/sda | ATA Samsung SSD 850 (scsi) | 120GB",
-            "disk2": "/dev/vda | Virtio Block Device (virtblk) | 107GB",
+        disks = {
+            "sda": {"size": "234441648", "device/vendor": "ATA     ", "device/model": "Samsung SSD 850 "},
+            "nvme0n1": {"size": "7501476528", "device/model": "SAMSUNG MZQLB3T8HALS-00007"},
+            "vda": {"size": "209715200", "device/device": ""},
+            "loop0": {"size": "1024"},
         }
 
-        self.base_parser_storage("tests/data/STORAGE.sample.8", STORAGE_OK, True)
+        with tempfile.TemporaryDirectory() as sysfs_dir:
+            for disk, files in disks.items():
+                os.makedirs(os.path.join(sysfs_dir, disk))
+                for name, value in files.items():
+                    os.makedirs(os.path.dirname(os.path.join(sysfs_dir, disk, name)), exist_ok=True)
+                    with open(os.path.join(sysfs_dir, disk, name), "w") as sysfs_file:
+                        sysfs_file.write(value)
 
-    def test_parser_storage_one_disk_lsblk(self):
-        """
-        Test the parser for a storage output with one disk using lsblk
-        """
+            storage_output = Extractor.get_storage_parser_sysfs(sysfs_dir)
 
         STORAGE_OK = {
-            "disk1": "/dev/sda | ATA Samsung SSD 840 (scsi) | 120GB"
+            "disk1": "/dev/nvme0n1 | SAMSUNG MZQLB3T8HALS-00007 | 3841GB",
+            "disk2": "/dev/sda | ATA Samsung SSD 850 | 120GB",
+            "disk3": "/dev/vda | n/a | 107GB",
         }
 
-        self.base_parser_storage("tests/data/STORAGE.sample.9", STORAGE_OK, True)
+        self.assertEqual(storage_output, STORAGE_OK, "Storage parser mismatch!")
+        self.assertEqual(Extractor.get_storage_parser_sysfs("non_existing_dir"), {})
 
-    def test_parser_storage_two_disks_lsblk(self):
+    def test_parser_numa_sysfs(self):
         """
-        Test the parser for a storage output with two disks using lsblk
+        Test the NUMA parser reading the nodes from sysfs
         """
-        STORAGE_OK = {
-            "disk1": "/dev/sda | ATA INTEL SSDSC2BX20 (scsi) | 200GB",
-            "disk2": "/dev/sdb | ATA INTEL SSDSC2BX01 (scsi) | 1600GB",
-        }
 
-        self.base_parser_storage("tests/data/STORAGE.sample.10", STORAGE_OK, True)
+        nodes = {"node0": "0-15,32-47", "node1": "16-31,48-63"}
 
-    def test_parser_storage_three_disks_lsblk(self):
-        """
-        Test the parser for a storage output with three disks using lsblk
-        """
+        with tempfile.TemporaryDirectory() as sysfs_dir:
+            for node, cpulist in nodes.items():
+                os.makedirs(os.path.join(sysfs_dir, node))
+                with open(os.path.join(sysfs_dir, node, "cpulist"), "w") as sysfs_file:
+                    sysfs_file.write(cpulist + "\n")
+            with open(os.path.join(sysfs_dir, "possible"), "w") as sysfs_file:
+                sysfs_file.write("0-1\n")
 
-        STORAGE_OK = {
-            "disk1": "/dev/sda | DELL PERC 6/i (scsi) | 1000GB",
-            "disk2": "/dev/sdc | DELL PERC 6/i (scsi) | 1000GB",
-            "disk3": "/dev/sdd | DELL PERC 6/i (scsi) | 1000GB",
+            numa_output = Extractor.get_numa_parser_sysfs(sysfs_dir)
+
+        NUMA_OK = {
+            "NUMA_nodes": 2,
+            "NUMA_node0_CPUs": "0-15,32-47",
+            "NUMA_node1_CPUs": "16-31,48-63",
         }
 
-        self.base_parser_storage("tests/data/STORAGE.sample.11", STORAGE_OK, True)
+        self.assertEqual(numa_output, NUMA_OK, "NUMA parser mismatch!")
+        self.assertEqual(Extractor.get_numa_parser_sysfs("non_existing_dir"), {})
 
-    def test_parser_storage_error_message_lsblk(self):
+    def test_format_disk_size(self):
         """
-        Test the parser for a storage output with an error message present using lsblk
+        Test the compact formatting of disk sizes
         """
 
-        STORAGE_OK = {
-            "disk1": "/dev/sda | DELL PERC 6/E Adapter (scsi) | 1000GB",
-            "disk2": "/dev/sdb | Dell VIRTUAL DISK (scsi) | 299GB",
-        }
-
-        self.base_parser_storage("tests/data/STORAGE.sample.12", STORAGE_OK, True)
+        self.assertEqual(Extractor.format_disk_size(512), "512B")
+        self.assertEqual(Extractor.format_disk_size(2900000), "2900kB")
+        self.assertEqual(Extractor.format_disk_size(999653638144), "1000GB")
+        self.assertEqual(Extractor.format_disk_size(16000900661248), "16.0TB")
 
     @patch("hepbenchmarksuite.plugins.extractor.Extractor.exec_cmd")
     def test_collect_gpu(self, mock_exec_cmd):
@@ -601,6 +820,29 @@ class TestHWExtractor(unittest.TestCase):
         self.assertEqual(result, {})
 
 
+    def test_collect_cached_sections(self):
+        """
+        Test that the static sections are only collected once, unless refreshed.
+        """
+        hw = Extractor(extra={"mode": ""})
+        collectors = ("collect_sw", "collect_cpu", "collect_gpu", "collect_bios",
+                      "collect_system", "collect_memory", "collect_storage")
+
+        with patch.multiple(Extractor, **{name: DEFAULT for name in collectors}) as mocks:
+            for mock in mocks.values():
+                mock.return_value = {}
+
+            hw.collect()
+            hw.collect()
+            for name in ("collect_sw", "collect_bios", "collect_system", "collect_storage"):
+                self.assertEqual(mocks[name].call_count, 1, name)
+            for name in ("collect_cpu", "collect_gpu", "collect_memory"):
+                self.assertEqual(mocks[name].call_count, 2, name)
+
+            hw.collect(refresh=True)
+            for name in collectors:
+                self.assertGreaterEqual(mocks[name].call_count, 2, name)
+
     def test_full_metadata(self):
         """
         Test the metadata schema
@@ -699,10 +941,10 @@ class TestCheckIfVirtual(unittest.TestCase):
         cls.file_C = "C.txt"  # File with hypervisor
 
         with open(cls.file_B, "w") as f:
-            f.write("physical system.\n")
+            f.write("processor\t: 0\nflags\t\t: fpu vme de pse tsc msr\n")
 
         with open(cls.file_C, "w") as f:
-            f.write("This system has a hypervisor.\n")
+            f.write("processor\t: 0\nflags\t\t: fpu vme de pse hypervisor lahf_lm\n")
 
     @classmethod
     def tearDownClass(cls):
@@ -713,18 +955,15 @@ class TestCheckIfVirtual(unittest.TestCase):
             os.remove(cls.file_C)
 
     def test_non_existent_file(self):
-        cmd = f"grep hypervisor {self.file_A}"
-        result = self.extractor.check_if_virtual(cmd=cmd)
+        result = self.extractor.check_if_virtual(cpuinfo_path=self.file_A)
         self.assertFalse(result, "File without hypervisor should return False.")
 
     def test_file_without_hypervisor(self):
-        cmd = f"grep hypervisor {self.file_B}"
-        result = self.extractor.check_if_virtual(cmd=cmd)
+        result = self.extractor.check_if_virtual(cpuinfo_path=self.file_B)
         self.assertFalse(result, "File without hypervisor should return False.")
 
     def test_file_with_hypervisor(self):
-        cmd = f"grep hypervisor {self.file_C}"
-        result = self.extractor.check_if_virtual(cmd=cmd)
+        result = self.extractor.check_if_virtual(cpuinfo_path=self.file_C)
         self.assertTrue(result, "File with hypervisor should return True.")
 
     @patch.object(Extractor, "check_if_virtual")
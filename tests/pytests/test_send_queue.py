@@ -4,12 +4,15 @@
 # of this distribution. For licensing information, see the COPYING file at
 # the top-level directory of this distribution.
 ###############################################################################
+import io
 import re
 from datetime import datetime
 import json
 import os
+import tarfile
+import tempfile
 import unittest
-from unittest.mock import patch, mock_open, MagicMock
+from unittest.mock import patch, mock_open, MagicMock, ANY
 
 from OpenSSL import crypto
 
@@ -165,11 +168,10 @@ class TestAMQ(unittest.TestCase):
 
     @patch("hepbenchmarksuite.plugins.send_queue.is_key_password_protected", return_value=True)
     @patch("hepbenchmarksuite.plugins.send_queue._check_certificate_config", return_value=True)
-    @patch("hepbenchmarksuite.plugins.send_queue.time.sleep", return_value=None)
     @patch("hepbenchmarksuite.plugins.send_queue.Listener", autospec=True)
     @patch("hepbenchmarksuite.plugins.send_queue.Path.is_file", return_value=True)
     @patch("hepbenchmarksuite.plugins.send_queue.stomp", autospec=True)
-    def test_send_message(self, mock_stomp, mock_filecheck, mock_listener, mock_sleep, mock_cert_check, mock_is_key_protected):
+    def test_send_message(self, mock_stomp, mock_filecheck, mock_listener, mock_cert_check, mock_is_key_protected):
         """Pass config object to send_queue"""
         test_args = {"port": 8181, "server": "home.cern", "topic": "test"}
         mock_conn = MagicMock()
@@ -181,16 +183,14 @@ class TestAMQ(unittest.TestCase):
             self.assertTrue(mock_filecheck.called)
 
         with patch.object(
-            send_queue, "open", mock_open(read_data="{'test':1}")
+            send_queue, "open", mock_open(read_data=b"{'test':1}")
         ) as mock_json:
             # mock the file read, and continue testing
 
             # Test no credentials
             with self.assertRaises(OSError):
                 send_queue.send_message(self.test_file_path, test_args)
-            mock_json.assert_called_once_with(
-                self.test_file_path, "r", encoding="utf-8"
-            )
+            mock_json.assert_called_once_with(self.test_file_path, "rb")
             mock_stomp.Connection.assert_called_once_with(
                 host_and_ports=[(test_args["server"], int(test_args["port"]))]
             )
@@ -226,9 +226,10 @@ class TestAMQ(unittest.TestCase):
                 logger.output,
             )
             mock_conn.send.assert_called_once_with(
-                test_args["topic"], "{'test':1}", "application/json"
+                test_args["topic"], b"{'test':1}", "application/json", headers={"receipt": ANY}
             )
             mock_conn.disconnect.assert_called()
+            mock_json.assert_called_once_with(self.test_file_path, "rb")
             mock_json.reset_mock()
             mock_stomp.reset_mock()
             mock_conn.reset_mock()
@@ -266,15 +267,78 @@ class TestAMQ(unittest.TestCase):
                 logger.output,
             )
             mock_conn.send.assert_called_once_with(
-                test_args["topic"], "{'test':1}", "application/json"
+                test_args["topic"], b"{'test':1}", "application/json", headers={"receipt": ANY}
             )
             mock_conn.get_listener.assert_called_once_with("mylistener")
             mock_conn.disconnect.assert_called()
 
-            mock_conn.get_listener("mylistener").configure_mock(status=False)
+            # The broker answers with an ERROR frame
+            listener = mock_conn.get_listener("mylistener")
+            mock_conn.send.side_effect = lambda *args, **kwargs: listener.configure_mock(status=False)
             with self.assertRaises(Exception):
                 send_queue.send_message(self.test_file_path, test_args)
 
+    @patch("hepbenchmarksuite.plugins.send_queue.Listener", autospec=True)
+    @patch("hepbenchmarksuite.plugins.send_queue.Path.is_file", return_value=True)
+    @patch("hepbenchmarksuite.plugins.send_queue.stomp", autospec=True)
+    def test_send_messages(self, mock_stomp, mock_filecheck, mock_listener):
+        """Several files are sent over a single connection"""
+        test_args = {"port": 60013, "server": "home.cern", "topic": "test", "username": "Dave", "password": "password"}
+        mock_conn = MagicMock()
+        mock_stomp.Connection.return_value = mock_conn
+
+        with patch.object(send_queue, "open", mock_open(read_data=b"{'test':1}")) as mock_json:
+            sent = send_queue.send_messages(["first.json", "second.json"], test_args)
+
+        self.assertListEqual(["first.json", "second.json"], sent)
+        self.assertEqual(2, mock_json.call_count)
+        mock_stomp.Connection.assert_called_once()
+        mock_conn.connect.assert_called_once_with(test_args["username"], test_args["password"], wait=True)
+        self.assertEqual(2, mock_conn.send.call_count)
+        mock_conn.disconnect.assert_called_once()
+
+    @patch("hepbenchmarksuite.plugins.send_queue.Listener", autospec=True)
+    @patch("hepbenchmarksuite.plugins.send_queue.Path.is_file", return_value=True)
+    @patch("hepbenchmarksuite.plugins.send_queue.stomp", autospec=True)
+    def test_send_messages_failure(self, mock_stomp, mock_filecheck, mock_listener):
+        """A file that fails is skipped, the following files are still sent"""
+        test_args = {"port": 60013, "server": "home.cern", "topic": "test", "username": "Dave", "password": "password"}
+        mock_conn = MagicMock()
+        mock_stomp.Connection.return_value = mock_conn
+        # The broker drops the connection after failing the second message
+        mock_conn.send.side_effect = [None, Exception("broken"), None]
+        mock_conn.is_connected.side_effect = [True, True, False, True, True]
+
+        with patch.object(send_queue, "open", mock_open(read_data=b"{'test':1}")), \
+                self.assertLogs("hepbenchmarksuite.plugins.send_queue", level="ERROR") as logger:
+            sent = send_queue.send_messages(["first.json", "second.json", "third.json"], test_args)
+
+        self.assertListEqual(["first.json", "third.json"], sent)
+        self.assertTrue(any("second.json could not be sent" in line for line in logger.output))
+        self.assertEqual(3, mock_conn.send.call_count)
+        # Connected once at the start, and again after the connection was dropped
+        self.assertEqual(2, mock_conn.connect.call_count)
+        mock_conn.disconnect.assert_called_once()
+
+    @patch("hepbenchmarksuite.plugins.send_queue.Listener", autospec=True)
+    @patch("hepbenchmarksuite.plugins.send_queue.Path.is_file", return_value=True)
+    @patch("hepbenchmarksuite.plugins.send_queue.stomp", autospec=True)
+    def test_send_messages_receipt_timeout(self, mock_stomp, mock_filecheck, mock_listener):
+        """A file that the broker does not acknowledge in time is not reported as sent"""
+        test_args = {"port": 60013, "server": "home.cern", "topic": "test", "username": "Dave", "password": "password"}
+        mock_conn = MagicMock()
+        mock_stomp.Connection.return_value = mock_conn
+        mock_conn.get_listener.return_value.answered.wait.side_effect = [True, False]
+
+        with patch.object(send_queue, "open", mock_open(read_data=b"{'test':1}")), \
+                self.assertLogs("hepbenchmarksuite.plugins.send_queue", level="ERROR") as logger:
+            sent = send_queue.send_messages(["first.json", "second.json"], test_args)
+
+        self.assertListEqual(["first.json"], sent)
+        self.assertTrue(any("second.json could not be sent" in line and "did not acknowledge" in line
+                            for line in logger.output))
+        self.assertEqual(2, mock_conn.send.call_count)
+
     def test_load_cert_and_key(self):
         connection = {"cert": "wrong cert path", "key": "wrong key path"}
         with self.assertRaisesRegex(Exception, ".*No such file or directory.*"):
@@ -289,6 +353,11 @@ class TestAMQ(unittest.TestCase):
         assert isinstance(cert, X509)
         assert isinstance(key, PKey)
 
+        # The unchanged files are not loaded again
+        cached_cert, cached_key = send_queue._load_cert_and_key(connection)
+        assert cached_cert is cert
+        assert cached_key is key
+
     def test_key_password_protection(self):
         # Change permissions for all certs to 600
         for dirpath, dirnames, filenames in os.walk('tests/data/certs'):
@@ -329,6 +398,70 @@ class TestAMQ(unittest.TestCase):
         cert = crypto.load_certificate(crypto.FILETYPE_PEM, open("tests/data/certs/valid.crt", 'rb').read())
         send_queue._validate_certificate(cert)
 
+    def test_download_ca_certificates(self):
+        with open("tests/data/certs/valid.crt", "rb") as f:
+            ca_contents = f.read()
+
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode="w:gz") as tar:
+            for name in ("AEGIS.pem", "ca_AEGIS/AEGIS.pem"):
+                member = tarfile.TarInfo(name)
+                member.size = len(ca_contents)
+                tar.addfile(member, io.BytesIO(ca_contents))
+
+        def get(url, **kwargs):
+            response = MagicMock()
+            response.__enter__.return_value = response
+            response.text = '<a href="ca_AEGIS-1.0.tar.gz">ca_AEGIS</a> <a href="README">README</a>'
+            response.raw = io.BytesIO(archive.getvalue())
+            response.content = ca_contents
+            return response
+
+        session = MagicMock()
+        session.__enter__.return_value = session
+        session.get.side_effect = get
+
+        with tempfile.TemporaryDirectory() as ca_dir, \
+                patch.object(send_queue, "CA_DIR", ca_dir), patch("requests.Session", return_value=session):
+            contents = send_queue.download_ca_certificates()
+            self.assertListEqual(sorted(["AEGIS.pem", "ca_AEGIS", *send_queue.CA_EXTRA]), sorted(os.listdir(ca_dir)))
+            # The CAs extracted at the top of CA_DIR and the extra CAs are returned
+            # without reading CA_DIR again
+            self.assertTupleEqual((ca_contents,) * (1 + len(send_queue.CA_EXTRA)), contents)
+
+        # The index, the tarball and the extra CAs are all requested through the same session
+        self.assertEqual(2 + len(send_queue.CA_EXTRA), session.get.call_count)
+
+    def test_validate_certificate_ca_store(self):
+        with open("tests/data/certs/self_signed.crt", 'rb') as f:
+            ca_contents = (f.read(),)
+        cert = crypto.load_certificate(crypto.FILETYPE_PEM, ca_contents[0])
+        send_queue._get_ca_store.cache_clear()
+        self.addCleanup(send_queue._get_ca_store.cache_clear)
+
+        with patch("hepbenchmarksuite.plugins.send_queue.download_ca_certificates",
+                   return_value=ca_contents) as mock_download:
+            # The certificate is found in the store, only its expiration fails
+            for _ in range(2):
+                with self.assertRaisesRegex(ValueError, ".*certificate has expired.*"):
+                    send_queue._validate_certificate(cert, verify=True)
+
+        # The CA certificates are downloaded and parsed once
+        mock_download.assert_called_once()
+
+    def test_listener_answered(self):
+        listener = send_queue.Listener(MagicMock())
+        self.assertFalse(listener.answered.is_set())
+        listener.on_receipt(MagicMock(headers={"receipt-id": "1"}))
+        self.assertTrue(listener.answered.is_set())
+        self.assertTrue(listener.status)
+
+        listener = send_queue.Listener(MagicMock())
+        listener.on_error(MagicMock(body="error"))
+        self.assertTrue(listener.answered.is_set())
+        self.assertFalse(listener.status)
+        self.assertEqual("error", listener.message)
+
     def test_listener(self):
         """TODO(anyone): listener function"""
         # needs implementation of AsyncMock() to test
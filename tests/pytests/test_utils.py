@@ -9,6 +9,7 @@
 
 import contextlib
 import difflib
+import json
 import os
 import sys
 import tarfile
@@ -95,6 +96,14 @@ def test_run_separated_commands__valid_commands():
     assert reply == 'testtest'
 
 
+@pytest.mark.parametrize("cmd", [["echo", "a | b"], ("echo", "a | b")])
+def test_run_piped_commands__argument_list(cmd):
+    # An argument list or tuple is a single command, its arguments are not split on '|'
+    return_code, reply, _ = utils.run_piped_commands(cmd)
+    assert return_code == 0
+    assert reply == 'a | b'
+
+
 @patch("hepbenchmarksuite.utils.run_piped_commands", return_value=(None, None, 'Command not found: dummy'))
 def test_run_separated_commands__unknown_command(patch):
     cmd = 'dummy'
@@ -133,6 +142,57 @@ def test_exec_cmd_success(cmd_str):
     assert return_code == 0
 
 
+def test_exec_cmd_argument_list():
+    """Test exec of a command given as an argument list."""
+
+    result, return_code = utils.exec_cmd(["echo", "a | b"])
+
+    assert return_code == 0
+    assert result == "a | b"
+
+
+def test_split_piped_commands():
+    """Test the split of a piped command string into argument lists."""
+
+    commands = utils.split_piped_commands("cat /proc/meminfo | awk '/MemTotal/ {print $2}'")
+
+    assert commands == (("cat", "/proc/meminfo"), ("awk", "/MemTotal/ {print $2}"))
+    assert utils.split_piped_commands("cat /proc/meminfo | awk '/MemTotal/ {print $2}'") is commands
+
+
+def test_exec_cmd_timeout():
+    """Test that a command running longer than the timeout fails."""
+
+    result, return_code = utils.exec_cmd(["sleep", "5"], timeout=0.1)
+
+    assert return_code != 0
+    assert result == "not_available"
+
+
+def test_dump_json():
+    """Test that the JSON dump is the same with and without orjson."""
+
+    data = {"b": {"d": [1, 2.5, None], "c": True}, "a": "ünicode"}
+    expected = '{\n  "a": "ünicode",\n  "b": {\n    "c": true,\n    "d": [\n      1,\n      2.5,\n      null\n    ]\n  }\n}'
+
+    assert utils.dump_json(data).decode("utf-8") == expected
+
+    with patch("hepbenchmarksuite.utils.orjson", None):
+        assert utils.dump_json(data).decode("utf-8") == expected
+
+
+def test_dump_report_json():
+    """Test that NaN values are written as null in the report, with and without orjson."""
+
+    data = {"score": float("nan"), "runs": [1.5, float("nan")], "host": {"cpus": (2, float("nan"))}}
+    expected = {"score": None, "runs": [1.5, None], "host": {"cpus": [2, None]}}
+
+    assert json.loads(utils.dump_report_json(data)) == expected
+
+    with patch("hepbenchmarksuite.utils.orjson", None):
+        assert json.loads(utils.dump_report_json(data)) == expected
+
+
 def test_bench_versions():
     """Test parsing of benchmark versions."""
 